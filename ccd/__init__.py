@@ -1,16 +1,42 @@
-try:
-    import ephem
-    from ccd.ephemeris import ChineseCalendarDate, EphemCCD
-except ImportError:
-    from ccd.base import ChineseCalendarDate
-
 from ccd.base import FastCCD
 
 __version__ = '0.2'
 
+
+def __getattr__(name):
+    # EphemCCD 依赖 PyEphem，导入较慢，所以在首次访问时才导入。
+    if name == 'EphemCCD':
+        try:
+            from ccd.ephemeris import EphemCCD as value
+        except ImportError as e:
+            raise AttributeError(
+                f'module {__name__!r} has no attribute {name!r}'
+            ) from e
+    elif name == 'ChineseCalendarDate':
+        try:
+            from ccd.ephemeris import ChineseCalendarDate as value
+        except ImportError:
+            from ccd.base import ChineseCalendarDate as value
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    from importlib.util import find_spec
+    names = [*globals(), 'ChineseCalendarDate']
+    # 没有安装 PyEphem 时无法导入 EphemCCD ， ChineseCalendarDate 则退回为 FastCCD
+    if find_spec('ephem') is not None:
+        names.append('EphemCCD')
+    return sorted(set(names))
+
+
 if __name__ == '__main__':
     from datetime import date, timedelta
 
+    from ccd import ChineseCalendarDate
+
     ccd = ChineseCalendarDate.strptime('农历2020年闰四月廿九', '农历%Y年%b月%a')
     assert ccd.timetuple() == (2020, 4, 29, True)
     ccd = ChineseCalendarDate(2020, 4, 29, True)
@@ -2,12 +2,17 @@
 定义农历日期的抽象类，其中实现了农历日期文本与数字转换的功能。
 """
 import re
+import sys
+from array import array
+from bisect import bisect_right
 from datetime import date, timedelta
-from typing import NamedTuple, NoReturn, Self, TypeAlias
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, NamedTuple, NoReturn, Self, Sequence, TypeAlias
 
 STEMS = '甲乙丙丁戊己庚辛壬癸'
 BRANCHES = '子丑寅卯辰巳午未申酉戌亥'
 ZODIACS = '鼠牛虎兔龙蛇马羊猴鸡狗猪'
+SEXAGENARY = tuple(STEMS[i % 10] + BRANCHES[i % 12] for i in range(60))  # 六十甲子，从甲子开始
 ORDS_MON = {
     1: '正', 2: '二', 3: '三', 4: '四', 5: '五', 6: '六',
     7: '七', 8: '八', 9: '九', 10: '十', 11: '十一', 12: '十二',
@@ -30,6 +35,7 @@ CCD_MIN = (1900, 12, 1, False)
 CCD_MAX = (2100, 11, 30, False)
 CCD_ORDINAL_MIN = 1  # FastCCD.MIN.to_ordinal()
 CCD_ORDINAL_MAX = 73029  # FastCCD.MAX.to_ordinal()
+FIRST_YEAR = 1900  # DATAS[0] 对应的农历年
 DATAS = (
     0x1000,  # 1900
     0x0ea4, 0x1d4a, 0xb654, 0x0c96, 0x1536, 0x954d, 0x0ad4, 0x16b2, 0x5754, 0x0ea4,  # 1901-1910
@@ -69,6 +75,13 @@ class MonthInfo(NamedTuple):
     ordinal: int
 
 
+class YearInfo(NamedTuple):
+    start: int  # 当年第一天的农历日序数
+    days: int  # 当年总天数
+    leap: int  # 当年闰月的序数，为 0 表示没有闰月
+    offsets: tuple  # 当年各月（含闰月）月初距离岁首的天数，按 _month_index() 索引
+
+
 def _check_date_fields(y, m, d, leap) -> NoReturn:
     """
     检查农历日期字段的类型和普遍适用的范围。
@@ -91,15 +104,16 @@ def _check_date_fields(y, m, d, leap) -> NoReturn:
         raise ValueError('农历日只能是一个从 1 到 30 的整数。')
 
 
-def _check_date_range(y, m, d, leap) -> NoReturn:
+def _check_date_range(y, m, d, leap) -> int:
     """
     检查农历日期字段的范围。
 
-    :return: 无返回值。
+    :return: 农历月所在的行号。
     :raise ValueError: 参数错误或无法转换。
     :raise OverflowError: 参数超出可计算范围。
     """
-    if not CCD_MIN <= (y, m, d, leap) <= CCD_MAX:
+    # 按 sort_key 的顺序比较，闰月排在所闰平月的所有日子之后
+    if not _KEY_MIN <= (y << 10 | m << 6 | leap << 5 | d) <= _KEY_MAX:
         raise OverflowError(
             '超出支持范围。请使用范围更广的历法算法。\n'
             '本类支持的范围是：{0} 至 {1}'.format(
@@ -107,15 +121,18 @@ def _check_date_range(y, m, d, leap) -> NoReturn:
                 FastCCD.MAX.strftime(),
             )
         )
+    if not _LOADED:
+        _load_tables()
     prefix = '闰' if leap else ''
-    if (month := Month(y, m, leap)) not in MONTHS:
+    if (row := _month_row(y, m, leap)) < 0:
         raise ValueError(
             f'农历 {y}年 没有 {prefix}{m}月。'
         )
-    if not d <= MONTHS[month].days:
+    if not d <= _STARTS[row + 1] - _STARTS[row]:
         raise ValueError(
             f'农历 {y}年 {prefix}{m}月 没有 {d} 日。'
         )
+    return row
 
 
 def _compile(fmt):
@@ -138,9 +155,9 @@ def _compile(fmt):
                 case 'm':
                     yield r'(?P<month>[闰閏]?(0[1-9]|1[012]))'
                 case 'd':
-                    yield r'(?P<day>[1-9]|[12][0-9]|30)'
+                    yield r'(?P<day>0?[1-9]|[12][0-9]|30)'
                 case 'b':
-                    yield r'(?P<month>[闰閏]?([正二三四五六七八九冬腊]|十一|十二))'
+                    yield r'(?P<month>[闰閏]?(十一|十二|[正二三四五六七八九十冬腊]))'
                 case 'a':
                     yield r'(?P<day>[初十廿][一二三四五六七八九]|[初二三]十|[卄卅])'
                 case '%':
@@ -152,56 +169,222 @@ def _compile(fmt):
         i += 1
 
 
-def _strftime(self, fmt):
-    leap = '闰' if self._leap else ''
+# 解析时，月份和日的文字到数值的映射，月份的值为 (月份, 是否闰月)
+_MONTH_TOKENS = {
+    prefix + token: (m, prefix != '')
+    for prefix in ('', '闰', '閏')
+    for token, m in (CHARS_MON | {f'{m:02d}': m for m in range(1, 13)}).items()
+}
+_DAY_TOKENS = CHARS_DAY | {str(d): d for d in range(1, 31)} | {f'{d:02d}': d for d in range(1, 10)}
+
+
+class LunarDateParser(object):
+    """
+    按照固定格式解析农历日期字符串的解析器。
+
+    格式只在创建时编译一次，适合反复解析同一格式的大量字符串。
+    """
+    __slots__ = 'fmt', '_match'
+
+    def __init__(self, fmt: str = '农历%Y年%b月%a'):
+        """
+        :param fmt: 格式。可用的格式化符号与 ``FastCCD.strptime()`` 相同。
+        :raise TypeError: 格式不是字符串。
+        :raise ValueError: 格式无法解析，或者缺少年、月或日。
+        """
+        pattern = re.compile(''.join(_compile(fmt)))
+        if not {'year', 'month', 'day'} <= pattern.groupindex.keys():
+            raise ValueError(
+                f'日期缺少年、月或日。'
+            )
+        self.fmt = fmt
+        self._match = pattern.fullmatch
+
+    def __repr__(self):
+        return f'{self.__class__.__module__}.{self.__class__.__qualname__}({self.fmt!r})'
+
+    def fields(self, string: str) -> tuple[int, int, int, bool]:
+        """
+        解析字符串，但不检查日期是否存在。
+
+        :param string: 字符串。必须与格式完全匹配。
+        :return: 由年、月、日、是否闰月组成的元组。
+        :raise ValueError: 字符串与格式不匹配。
+        """
+        if (result := self._match(string)) is None:
+            raise ValueError(
+                f'日期字符串 "{string} 与指定格式 "{self.fmt}" 不匹配。'
+            )
+        y, m, d = result.group('year', 'month', 'day')
+        m, leap = _MONTH_TOKENS[m]
+        return int(y), m, _DAY_TOKENS[d], leap
+
+    def parse(self, string: str, cls: type['FastCCD'] = None) -> 'FastCCD':
+        """
+        将字符串转换为农历日期。
+
+        :param string: 字符串。必须与格式完全匹配。
+        :param cls: 农历日期类型。如不提供则使用 ``FastCCD`` 。
+        :return: 农历日期。
+        :raise ValueError: 字符串与格式不匹配，或日期不存在。
+        :raise OverflowError: 日期超出计算范围。
+        """
+        return (FastCCD if cls is None else cls)(*self.fields(string))
+
+    def parse_many(self, strings: Iterable[str], cls: type['FastCCD'] = None, into: str = 'lunar',
+                   errors: list = None) -> Iterator:
+        """
+        逐个解析一组字符串，按需生成转换结果，不会一次性读入所有字符串。
+
+        转换为 ``FastCCD`` 的序数或公历日期时，不会创建中间的农历日期对象。
+
+        :param strings: 字符串组成的可迭代对象，比如逐行读取的文件。每个字符串都必须与格式完全匹配（包括首尾的空白）。
+        :param cls: 农历日期类型。如不提供则使用 ``FastCCD`` 。
+        :param into: 转换结果：为 ``'lunar'`` 时生成农历日期；为 ``'ordinal'`` 时生成 ``to_ordinal()`` 的结果；
+                     为 ``'date'`` 时生成公历日期。
+        :param errors: 如果提供一个列表，无法转换的字符串会被跳过，并以 (下标, 字符串, 异常) 的形式追加到列表中；
+                       否则遇到第一个无法转换的字符串时抛出异常。
+        :return: 生成器。
+        :raise ValueError: into 的值不受支持。
+        """
+        if into not in ('lunar', 'ordinal', 'date'):
+            raise ValueError(
+                f'不支持转换为 "{into}"。'
+            )
+        return self._parse_many(strings, FastCCD if cls is None else cls, into, errors)
+
+    def _parse_many(self, strings, cls, into, errors) -> Iterator:
+        fields = self.fields
+        if cls is not FastCCD:
+            convert = {
+                'lunar': lambda f: cls(*f),
+                'ordinal': lambda f: cls(*f).to_ordinal(),
+                'date': lambda f: cls(*f).to_date(),
+            }[into]
+        elif into == 'lunar':
+            def convert(f):
+                _check_date_range(*f)
+                return cls._from_fields(*f)
+        elif into == 'ordinal':
+            convert = lambda f: _STARTS[_check_date_range(*f)] + f[2] - 1
+        else:
+            convert = lambda f: date.fromordinal(_STARTS[_check_date_range(*f)] + f[2] - 1 + _DATE_OFFSET)
+        for i, string in enumerate(strings):
+            try:
+                yield convert(fields(string))
+            except (TypeError, ValueError, OverflowError) as e:
+                if errors is None:
+                    raise
+                errors.append((i, string, e))
+
+
+# strptime() 使用的解析器缓存，同一格式只会编译一次
+_get_parser = lru_cache(maxsize=128)(LunarDateParser)
+
+
+# 格式化符号对应的 str.format 替换字段，{0} 为农历日期
+_FORMAT_FIELDS = {
+    'Y': '{0._year:04d}',
+    'm': '{0._month:02d}',
+    'd': '{0._day:02d}',
+    'G': '{0.year_stem_branch}',
+    'g': '{0.year_zodiac}',
+    'b': '{0.month_ordinal}',
+    'a': '{0.day_ordinal}',
+    '%': '%',
+}
+
+
+@lru_cache(maxsize=256)
+def _compile_format(fmt: str) -> Callable[['FastCCD'], str]:
+    """
+    将农历日期格式编译为 ``str.format`` 模板，同一格式只会编译一次。
+
+    :return: 以农历日期为唯一参数的格式化函数。
+    :raise TypeError: 格式不是字符串。
+    :raise ValueError: 格式无法解析。
+    """
+    if fmt.__class__ is not str:
+        raise TypeError(
+            '请以字符串形式提供农历日期格式。'
+        )
+    parts = []
     i, n = 0, len(fmt)
     while i < n:
-        if fmt[i] != '%':
-            yield fmt[i]
+        if (c := fmt[i]) != '%':
+            parts.append('{{' if c == '{' else '}}' if c == '}' else c)
         else:
             if i == n - 1:  # 枚举到最后一个字符
                 raise ValueError(f'无法解析格式化符号 "%"，所在位置 {i}')
-            match (flag := fmt[i := i + 1]):  # 取下一个字符
-                case 'Y':
-                    yield f'{self._year:04d}'
-                case 'm':
-                    yield f'{self._month:02d}'
-                case 'd':
-                    yield f'{self._day:02d}'
-                case 'G':
-                    yield self.year_stem_branch
-                case 'g':
-                    yield self.year_zodiac
-                case 'b':
-                    yield leap + ORDS_MON[self._month]
-                case 'a':
-                    yield ORDS_DAY[self._day]
-                case '%':
-                    yield '%'
-                case _:
-                    raise ValueError(f'无法解析格式化符号 "%{flag}"，所在位置 {i}')
+            try:
+                parts.append(_FORMAT_FIELDS[flag := fmt[i := i + 1]])  # 取下一个字符
+            except KeyError:
+                raise ValueError(f'无法解析格式化符号 "%{flag}"，所在位置 {i}') from None
         i += 1
+    return ''.join(parts).format
 
 
 def _leap_month(yi) -> int:
     """
     从某一年的数据中取出当年的闰月。
 
-    :param yi: 年份索引，从 0 开始表示 1900 年及往后的农历年。
+    :param yi: 年份索引，从 0 开始表示 FIRST_YEAR 年及往后的农历年。
     :return: 月份序数，从 1 开始表示一月及往后的各个平月。为 0 表示当年没有闰月。
     """
     return DATAS[yi] >> 13
 
 
-def _last_day(yi, mo=0) -> int:
+def _month_index(m, leap, lmo) -> int:
+    """
+    求某个农历月是当年的第几个月（从 0 开始，闰月也算一个月）。
+
+    :param m: 月份序数。
+    :param leap: 是否为闰月。
+    :param lmo: 当年闰月的序数，为 0 表示当年没有闰月。
     """
-    取出数据中某年某个平月的最后一天。
+    return m if leap or 0 < lmo < m else m - 1
+
+
+# 按 当年闰月的序数 索引的当年所有月份（月份序数, 是否闰月），按先后顺序排列
+_ORDERS = tuple(
+    tuple((mo, False) for mo in range(1, lmo + 1)) +
+    (((lmo, True),) if lmo else ()) +
+    tuple((mo, False) for mo in range(lmo + 1, 13))
+    for lmo in range(13)
+)
+
 
-    :param yi: 年份索引，从 0 开始表示 1900 年及往后的农历年。
-    :param mo: 月份序数，从 1 开始表示一月及后面各个平月。如果不提供则表示为当年闰月。
-    :return: 当月最后一天的序号，也是当月总天数。
+def _unzip_records(datas, first_year, first, last):
     """
-    return (DATAS[yi] >> mo & 1) + 29
+    按顺序(解压)生成每个农历月的记录，供 ``_install()`` 使用。\n
+    只生成 first 至 last 之间的月份，
+    比如内置数据中农历1900年有效数据只有十二月，农历2100年有效数据只有一到十一月。
+
+    :param datas: 逐年数据，格式与 DATAS 相同。
+    :param first_year: datas[0] 对应的农历年。
+    :param first: 第一个有效农历月的 (年, 月, 是否闰月)。
+    :param last: 最后一个有效农历月的 (年, 月, 是否闰月)。
+    :return: 由 月份键、月初序数、岁首行号 三个数组组成的元组，含义见 ``_install()`` 。
+    """
+    keys, starts, year_rows = array('i'), array('i', [CCD_ORDINAL_MIN]), array('i')
+    started = finished = False
+    for yi, data in enumerate(datas):
+        year_rows.append(len(keys))
+        if finished:
+            continue
+        for i, (mo, leap) in enumerate(_ORDERS[data >> 13]):
+            if not started:
+                if (first_year + yi, mo, leap) != first:
+                    continue
+                started = True
+                year_rows[-1] = len(keys) - i
+            keys.append(yi << 5 | mo << 1 | leap)
+            starts.append(starts[-1] + (data >> (0 if leap else mo) & 1) + 29)
+            if (first_year + yi, mo, leap) == last:
+                finished = True
+                break
+    year_rows.append(len(keys))
+    return keys, starts, year_rows
 
 
 def _unzip_months():
@@ -209,62 +392,267 @@ def _unzip_months():
     按顺序(解压)生成每个农历月。\n
     每一项都是一个元组，由一个 ``Month`` 和一个 ``MonthInfo`` 组成。
     """
-    mos = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12)  # 平年所有月份的序数
-    start = DATE_MIN.replace()
-    ordinal = CCD_ORDINAL_MIN
-
-    # -------- 农历1900年有效数据只有十二月1个平月
-    days = _last_day(0, mos[-1])
-    yield Month(1900, mos[-1], False), MonthInfo(start, days, ordinal)
-    start += timedelta(days=days)
-    ordinal += days
-    # --------
-    for yi in range(1, (eyi := len(DATAS) - 1)):  # 1901~2099
-        # 平年（没有闰月）
-        if (lmo := _leap_month(yi)) == 0:
-            for mo in mos:
-                days = _last_day(yi, mo)
-                yield Month(1900 + yi, mo, False), MonthInfo(start, days, ordinal)
-                start += timedelta(days=days)
-                ordinal += days
-        # 闰年（有唯一一个闰月）
+    for row, key in enumerate(_KEYS):
+        ordinal = _STARTS[row]
+        start = date.fromordinal(ordinal + _DATE_OFFSET)
+        month = Month(FIRST_YEAR + (key >> 5), key >> 1 & 15, key & 1 == 1)
+        yield month, MonthInfo(start, _STARTS[row + 1] - ordinal, ordinal)
+
+
+def _unzip_years():
+    """
+    按顺序生成每个农历年的 ``YearInfo`` 。\n
+    农历1900年与农历2100年只统计有效数据中的月份。
+    """
+    for yi in range(CCD_MIN[0] - FIRST_YEAR, CCD_MAX[0] - FIRST_YEAR + 1):
+        lo, hi = _year_rows(yi)
+        start = _STARTS[lo]
+        offsets = [0] * 13
+        for row in range(lo, hi):
+            offsets[row - _YEAR_ROWS[yi]] = _STARTS[row] - start
+        yield YearInfo(start, _STARTS[hi] - start, _leap_month(yi), tuple(offsets))
+
+
+# FastCCD 所使用的数据，在首次使用时才由 _load_tables() 从 DATAS 解压，以加快 import 速度；
+# 也可以是从二进制文件映射到内存中的只读数组（见 ccd.tablefile）。
+# 每个农历月对应一行记录，按先后顺序排列：
+#
+# - _KEYS，每个农历月的月份键，按位压缩为 年份索引(其余高位) | 月份序数(4位) | 是否闰月(1位)，
+#   因此也是按先后顺序从小到大排列的；
+# - _STARTS，每个农历月月初的农历日序数，末尾多一项 CCD_ORDINAL_MAX + 1，相邻两项之差即为当月总天数；
+# - _YEAR_ROWS，以年份索引为下标，当年正月所在的行号（第一年可能是负数，表示数据从年中开始），
+#   末尾多一项记录总行数。加上 _month_index() 即为任意农历月的行号。
+_LOADED = False
+_KEYS: Sequence[int] = ()
+_STARTS: Sequence[int] = ()
+_YEAR_ROWS: Sequence[int] = ()
+
+# 以下数据表只供外部读取，在首次访问时才生成，本模块内部不使用：
+#
+# - MONTHS: dict[Month, MonthInfo]，以月份为键，月份信息为值；
+# - NEW_MOONS: dict[date, tuple]，以月初公历日期为键，月份及总天数为值；
+# - YEARS: tuple[YearInfo, ...]，以年份索引（从 0 开始表示 FIRST_YEAR 年）为下标的农历年信息。
+_LAZY_TABLES = ('MONTHS', 'NEW_MOONS', 'YEARS')
+
+
+def _load_tables() -> NoReturn:
+    """解压内置数据表。重复调用不会重新解压。"""
+    global _GENERATION
+    if _LOADED:
+        return
+    generation = _GENERATION
+    _install(DATAS, FIRST_YEAR, DATE_MIN, *_unzip_records(*BUILTIN[:2], *BUILTIN[3:]))
+    _GENERATION = generation  # 首次解压内置数据表不算切换
+
+
+def __getattr__(name):
+    if name in _LAZY_TABLES:
+        _load_tables()
+        if name == 'MONTHS':
+            value = dict(_unzip_months())
+        elif name == 'NEW_MOONS':
+            value = {inf.start: (*mon, inf.days) for mon, inf in __getattr__('MONTHS').items()}
         else:
-            for mo in mos[:lmo]:
-                days = _last_day(yi, mo)
-                yield Month(1900 + yi, mo, False), MonthInfo(start, days, ordinal)
-                start += timedelta(days=days)
-                ordinal += days
-            # -------- 当年的闰月
-            days = _last_day(yi, )
-            yield Month(1900 + yi, lmo, True), MonthInfo(start, days, ordinal)
-            start += timedelta(days=days)
-            ordinal += days
-            # --------
-            for mo in mos[lmo:]:
-                days = _last_day(yi, mo)
-                yield Month(1900 + yi, mo, False), MonthInfo(start, days, ordinal)
-                start += timedelta(days=days)
-                ordinal += days
-    # 农历2100年有效数据只有一到十一月总共11个平月
-    for mo in mos[:-1]:
-        days = _last_day(eyi, mo)
-        yield Month(1900 + eyi, mo, False), MonthInfo(start, days, ordinal)
-        start += timedelta(days=days)
-        ordinal += days
-
-
-# 以月份为键，月份信息为值
-MONTHS: dict[Month, MonthInfo] = dict(_unzip_months())
-
-# 以月初公历日期为键，月份及总天数为值
-NEW_MOONS: dict[date, tuple] = {
-    __inf.start: (*__mon, __inf.days)
-    for __mon, __inf in MONTHS.items()
-}
+            value = tuple(_unzip_years())
+        globals()[name] = value
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def _month_row(y, m, leap) -> int:
+    """
+    求某个农历月所在的行号。
+
+    :return: 行号。农历月不存在或超出范围时返回 -1 。
+    """
+    yi = y - FIRST_YEAR
+    if not 0 <= yi < len(DATAS):
+        return -1
+    row = _YEAR_ROWS[yi] + _month_index(m, leap, DATAS[yi] >> 13)
+    if 0 <= row < len(_KEYS) and _KEYS[row] == yi << 5 | m << 1 | leap:
+        return row
+    return -1
+
+
+def _year_rows(yi) -> tuple[int, int]:
+    """
+    求某年第一个有效农历月的行号，以及下一年第一个有效农历月的行号。
+
+    :param yi: 年份索引，调用方需确保其在支持范围内。
+    """
+    return max(_YEAR_ROWS[yi], 0), max(_YEAR_ROWS[yi + 1], 0)
+
+
+# 公历日期序数与农历日期序数的差值
+_DATE_OFFSET = DATE_MIN.toordinal() - CCD_ORDINAL_MIN
+
+# CCD_MIN 与 CCD_MAX 的 sort_key ，供 _check_date_range() 比较
+_KEY_MIN = 1900 << 10 | 12 << 6 | 1
+_KEY_MAX = 2100 << 10 | 11 << 6 | 30
+
+# 公历日期序数为 n 的日子，其日干支为 SEXAGENARY[(n + _DAY_CYCLE) % 60]。比如公历 2000-01-01 为戊午日
+_DAY_CYCLE = 14
+
+# 逐日查找表，以农历日序数减一为下标，每一项按位压缩了当天的农历年月日：
+# 年份索引(其余高位) | 月份序数(4位) | 是否闰月(1位) | 日(5位)
+_DAYS: Sequence[int] | None = None
+_DENSE = False
+# 从二进制文件映射到内存中的逐日查找表
+_MAPPED_DAYS: Sequence[int] | None = None
+# 启用复用实例时，以 sort_key 为键的 FastCCD 实例表，在创建日期时逐个填充
+_INTERNED: dict[int, 'FastCCD'] | None = None
+
+
+def _unzip_days(keys, starts) -> array:
+    """
+    生成逐日查找表。\n
+    每项 4 字节，使用内置数据时共 73029 项，实测占用 292196 字节（约 285KiB）内存。
+
+    :param keys: 每个农历月的月份键。
+    :param starts: 每个农历月月初的农历日序数，末尾多一项。
+    """
+    days = []
+    for row, key in enumerate(keys):
+        code = key << 5
+        days.extend(range(code + 1, code + starts[row + 1] - starts[row] + 1))
+    return array('I', days)
+
+
+class Table(NamedTuple):
+    """
+    ``FastCCD`` 所使用的农历数据表。
+    """
+    datas: Sequence[int]  # 逐年数据，格式与 DATAS 相同
+    first_year: int  # datas[0] 对应的农历年
+    start: date  # 第一个有效农历月的月初对应的公历日期
+    first: tuple[int, int, bool]  # 第一个有效农历月的 (年, 月, 是否闰月)
+    last: tuple[int, int, bool]  # 最后一个有效农历月的 (年, 月, 是否闰月)
+
+
+BUILTIN = Table(DATAS, FIRST_YEAR, DATE_MIN, (1900, 12, False), (2100, 11, False))
+"""内置的农历数据表，范围是农历1900年十二月至农历2100年十一月。"""
+
+# 数据表每次切换都会递增，供其它模块判断其缓存是否过期
+_GENERATION = 0
+
+
+def _install(datas, first_year, start, keys, starts, year_rows, days=None) -> NoReturn:
+    """
+    切换 ``FastCCD`` 所使用的数据，并更新相关的常量。
+
+    :param datas: 逐年数据，格式与 DATAS 相同。
+    :param first_year: datas[0] 对应的农历年。
+    :param start: 第一个有效农历月的月初对应的公历日期。
+    :param keys: 每个农历月的月份键。
+    :param starts: 每个农历月月初的农历日序数，末尾多一项。
+    :param year_rows: 每年正月所在的行号，末尾多一项。
+    :param days: 逐日查找表。如不提供则在需要时生成。
+    """
+    global DATAS, FIRST_YEAR, DATE_MIN, DATE_MAX, CCD_MIN, CCD_MAX, CCD_ORDINAL_MAX
+    global _KEYS, _STARTS, _YEAR_ROWS, _DATE_OFFSET, _LOADED, _DAYS, _MAPPED_DAYS, _GENERATION
+    global _KEY_MIN, _KEY_MAX
+    first, last = keys[0], keys[-1]
+    DATAS, FIRST_YEAR, DATE_MIN = datas, first_year, start
+    _KEYS, _STARTS, _YEAR_ROWS = keys, starts, year_rows
+    CCD_MIN = (first_year + (first >> 5), first >> 1 & 15, 1, first & 1 == 1)
+    CCD_MAX = (first_year + (last >> 5), last >> 1 & 15, starts[-1] - starts[-2], last & 1 == 1)
+    _KEY_MIN, _KEY_MAX = _pack_key(*CCD_MIN), _pack_key(*CCD_MAX)
+    CCD_ORDINAL_MAX = starts[-1] - 1
+    _DATE_OFFSET = DATE_MIN.toordinal() - CCD_ORDINAL_MIN
+    DATE_MAX = date.fromordinal(CCD_ORDINAL_MAX + _DATE_OFFSET)
+    _DAYS, _MAPPED_DAYS = None, days
+    if _INTERNED is not None:
+        _INTERNED.clear()
+    _LOADED = True
+    for name in _LAZY_TABLES:
+        globals().pop(name, None)
+    FastCCD.MIN = _LazyBound('MIN', CCD_MIN)
+    FastCCD.MAX = _LazyBound('MAX', CCD_MAX)
+    _GENERATION += 1
+
+
+def use_table(table: Table = None) -> NoReturn:
+    """
+    切换 ``FastCCD`` 所使用的农历数据表。
+
+    切换后，本模块的 ``DATAS`` 、 ``DATE_MIN`` 、 ``CCD_MAX`` 等常量及 ``FastCCD.MIN`` 、 ``FastCCD.MAX``
+    会随之更新，各个数据表也会重新生成。已经创建的农历日期不受影响，但不应与切换后创建的日期混用。
+
+    :param table: 新的农历数据表。如不提供则恢复为内置的数据表。
+    :raise ValueError: 数据表中的第一个或最后一个有效农历月不存在。
+    """
+    table = BUILTIN if table is None else table
+    datas, fy = tuple(table.datas), table.first_year
+    if table.first[0] != fy:
+        raise ValueError('第一个有效农历月必须在 first_year 这一年。')
+    for y, m, leap in (table.first, table.last):
+        if not 0 <= y - fy < len(datas) or leap and datas[y - fy] >> 13 != m or not 1 <= m <= 12:
+            raise ValueError(f'数据表中没有农历 {y}年 {"闰" if leap else ""}{m}月。')
+
+    _install(datas, fy, table.start, *_unzip_records(datas, fy, table.first, table.last))
+
+
+def dense_lookup(enable: bool = True) -> NoReturn:
+    """
+    切换 ``FastCCD`` 从公历日期或序数查找农历日期的方式。
+
+    启用后，首次查找时会生成一张逐日的查找表（约 285KiB），此后每次查找只需读取一次数组；
+    停用后按月二分查找，并释放查找表占用的内存。默认停用。
+
+    :param enable: 是否启用逐日查找表。
+    """
+    global _DENSE, _DAYS
+    _DENSE = bool(enable)
+    if not _DENSE:
+        _DAYS = None
+
+
+def intern_dates(enable: bool = True) -> NoReturn:
+    """
+    切换 ``FastCCD`` 是否复用同一日期的实例。
+
+    启用后，构造方法、 ``from_date()`` 、 ``from_ordinal()`` 、 ``replace()`` 、加减运算、反序列化等
+    对同一个日期总是返回同一个实例，从而减少内存分配，大量引用相同日期时也更省内存；
+    已经复用的日期再次构造时也无需重新检查范围。实例表在创建日期时逐个填充，使用内置数据时最多 73029 项。
+    停用后释放实例表。默认停用。
+
+    只对 ``FastCCD`` 本身生效，不影响其子类。
+
+    :param enable: 是否复用实例。
+    """
+    global _INTERNED
+    if not enable:
+        _INTERNED = None
+    elif _INTERNED is None:
+        _INTERNED = {}
+
+
+def _locate(n: int) -> tuple:
+    """
+    查找农历日序数对应的农历日期。
+
+    :param n: 农历日序数，调用方需确保其在支持范围内。
+    :return: 由年、月、日、是否闰月组成的元组。
+    """
+    global _DAYS
+    if not _LOADED:
+        _load_tables()
+    if _DENSE:
+        if _DAYS is None:
+            _DAYS = _unzip_days(_KEYS, _STARTS) if _MAPPED_DAYS is None else _MAPPED_DAYS
+        code = _DAYS[n - 1]
+        return FIRST_YEAR + (code >> 10), code >> 6 & 15, code & 31, code & 32 == 32
+    row = bisect_right(_STARTS, n) - 1
+    key = _KEYS[row]
+    return FIRST_YEAR + (key >> 5), key >> 1 & 15, n - _STARTS[row] + 1, key & 1 == 1
+
+
+# 加减的天数跨越不超过这么多个农历月时，从当前月份开始逐月推算，否则按序数重新查找
+_STEP_MONTHS = 2
 
 
 class FastCCD(object):
-    __slots__ = '_year', '_month', '_day', '_leap', '_hashcode'
+    __slots__ = '_year', '_month', '_day', '_leap', '_key'
 
     # 构造方法
 
@@ -283,13 +671,12 @@ class FastCCD(object):
         :raise OverflowError: 参数超出计算范围。
         """
         _check_date_fields(year, month, day, is_leap_month)
-        _check_date_range(year, month, day, is_leap_month)
-        self = object.__new__(cls)
-        self._year = year
-        self._month = month
-        self._day = day
-        self._leap = is_leap_month
-        self._hashcode = -1
+        # 字段检查通过后，sort_key 与日期一一对应；实例表中已有的日期一定在范围内
+        if _INTERNED is None or cls is not FastCCD or (
+                self := _INTERNED.get(year << 10 | month << 6 | is_leap_month << 5 | day)
+        ) is None:
+            _check_date_range(year, month, day, is_leap_month)
+            self = cls._from_fields(year, month, day, is_leap_month)
         return self
 
     @classmethod
@@ -306,33 +693,27 @@ class FastCCD(object):
         - ``%a`` ，序数纪日法表示的农历日，比如“初一”、“十五”、“廿一”。
         - ``%%`` ，符号 "%" 自身。
 
+        同一格式只会编译一次。需要反复解析时也可以直接使用 ``LunarDateParser`` 。
+
         :param string: 字符串。
         :param fmt: 格式。必须与字符串完全匹配。
         :return: 农历日期。
         """
-        regex = ''.join(_compile(fmt))
-        result = re.fullmatch(regex, string)
-        if result is None:
-            raise ValueError(
-                f'日期字符串 "{string} 与指定格式 "{fmt}" 不匹配。'
-            )
-        data = result.groupdict()
-        y, m, d = data.get('year'), data.get('month'), data.get('day')
-        if y is None or m is None or d is None:
-            raise ValueError(
-                f'日期缺少年、月或日。'
-            )
-        y = int(y)
-        leap = m.startswith('闰') or m.startswith('閏')
-        m = m[1:] if leap else m
-        try:
-            m = int(m) if m.isdecimal() else CHARS_MON[m]
-            d = int(d) if d.isdecimal() else CHARS_DAY[d]
-        except KeyError as e:
-            raise ValueError(
-                f'无法识别的表述："{e.args[0]}"'
-            ) from None
-        return cls(y, m, d, leap)
+        return cls(*_get_parser(fmt).fields(string))
+
+    @classmethod
+    def strptime_many(cls, strings: Iterable[str], fmt: str = '农历%Y年%b月%a', into: str = 'lunar',
+                      errors: list = None) -> Iterator:
+        """
+        将一组字符串按照同一格式逐个转换，按需生成转换结果。详见 ``LunarDateParser.parse_many()`` 。
+
+        :param strings: 字符串组成的可迭代对象。
+        :param fmt: 格式。可用的格式化符号与 ``strptime()`` 相同。
+        :param into: 转换结果，可以是 ``'lunar'`` 、 ``'ordinal'`` 或 ``'date'`` 。
+        :param errors: 如果提供一个列表，无法转换的字符串会被跳过并记录到列表中，而不是抛出异常。
+        :return: 生成器。
+        """
+        return _get_parser(fmt).parse_many(strings, cls, into, errors)
 
     @classmethod
     def today(cls) -> Self:
@@ -356,23 +737,8 @@ class FastCCD(object):
             raise OverflowError(
                 '公历日期超出农历算法转换范围。'
             )
-        starts = list(NEW_MOONS.keys())
-        le, ri, mid = 0, len(starts) - 1, len(starts) // 2
-        while ri - le > 1:
-            if starts[mid] < _date:
-                le = mid
-            elif starts[mid] > _date:
-                ri = mid
-            else:
-                start = starts[mid]
-                break
-            mid = le + (ri - le) // 2
-        else:
-            start = starts[mid]
-
-        y, m, leap, days = NEW_MOONS[start]
-        offset = int((_date - start) / timedelta(days=1))
-        return cls.__new__(cls, y, m, offset + 1, leap)
+        y, m, d, leap = _locate(_date.toordinal() - _DATE_OFFSET)
+        return cls.__new__(cls, y, m, d, leap)
 
     @classmethod
     def from_ordinal(cls, __n: int) -> Self:
@@ -380,32 +746,198 @@ class FastCCD(object):
             raise OverflowError(
                 '超出农历日期范围。'
             )
-        ordinals = tuple(v.ordinal for v in MONTHS.values())
-        le, ri, mid = 0, len(ordinals) - 1, len(ordinals) // 2
-        while ri - le > 1:
-            if ordinals[mid] < __n:
-                le = mid
-            elif ordinals[mid] > __n:
-                ri = mid
-            else:
-                mi = mid
-                break
-            mid = le + (ri - le) // 2
-        else:
-            mi = mid
-
-        months = tuple(MONTHS.keys())
-        if MONTHS[months[-1]].ordinal <= __n:
-            _y, _m, _, _leap = CCD_MAX
-            month = Month(_y, _m, _leap)
-        else:
-            month = months[mi]
-        y, m, leap = month
-        d = __n - MONTHS[month].ordinal + 1
+        y, m, d, leap = _locate(__n)
         return cls.__new__(cls, y, m, d, leap)
 
     fromordinal = from_ordinal
 
+    @classmethod
+    def _from_fields(cls, y, m, d, leap) -> Self:
+        """不经检查直接创建农历日期。调用方需确保日期存在且在支持范围内。"""
+        key = y << 10 | m << 6 | leap << 5 | d
+        if _INTERNED is not None and cls is FastCCD:
+            if (self := _INTERNED.get(key)) is None:
+                self = _INTERNED[key] = object.__new__(cls)
+                self._year, self._month, self._day, self._leap, self._key = y, m, d, leap, key
+            return self
+        self = object.__new__(cls)
+        self._year = y
+        self._month = m
+        self._day = d
+        self._leap = leap
+        self._key = key
+        return self
+
+    @classmethod
+    def range(cls, start: 'FastCCD', stop: 'FastCCD', step: int | timedelta = 1, *,
+              tuples: bool = False, gregorian: bool = False) -> Iterator:
+        """
+        逐日迭代 start（含）至 stop（不含）之间的农历日期，与内置的 ``range()`` 类似。
+
+        迭代时沿着月份表顺序推进，不会为每一天重新查找，并且只在需要时才生成下一个日期。
+
+        :param start: 第一个农历日期。
+        :param stop: 结束的农历日期，不会被迭代到。
+        :param step: 步长（天数）。为负数时从 start 倒序迭代至 stop 。
+        :param tuples: 为真时生成 ``timetuple()`` 形式的元组，而不是农历日期。
+        :param gregorian: 为真时生成 (农历日期, 公历日期) 二元组。
+        :return: 生成器。
+        :raise ValueError: 步长为 0 。
+        :raise OverflowError: start 或 stop 超出当前历法的范围。
+        """
+        step = step.days if isinstance(step, timedelta) else step
+        if step == 0:
+            raise ValueError(
+                '步长不能为 0 。'
+            )
+        # start 与 stop 不是当前类型时需要转换，以确保它们在当前历法的范围内
+        start, stop = (x if type(x) is cls else cls.from_date(x.to_date()) for x in (start, stop))
+        days = range(start.to_date().toordinal(), stop.to_date().toordinal(), step)
+        return cls._iter_days(start, days, tuples, gregorian)
+
+    @classmethod
+    def _iter_days(cls, start, days: range, tuples, gregorian) -> Iterator:
+        if not days:
+            return
+        forward = days.step > 0
+        months = cls._iter_months(start, forward)
+        y, m, leap, first, total = next(months)
+        for n in days:
+            if forward:
+                while n >= first + total:
+                    y, m, leap, first, total = next(months)
+            else:
+                while n < first:
+                    y, m, leap, first, total = next(months)
+            item = (y, m, n - first + 1, leap) if tuples else cls._from_fields(y, m, n - first + 1, leap)
+            yield (item, date.fromordinal(n)) if gregorian else item
+
+    @classmethod
+    def _iter_months(cls, start: 'FastCCD', forward: bool = True) -> Iterator[tuple]:
+        """
+        从 start 所在的农历月开始，逐月生成 (年, 月, 是否闰月, 月初的公历日期序数, 总天数) 。
+
+        :param start: 当前类型的农历日期。
+        :param forward: 为真时向后迭代，否则向前迭代。
+        """
+        keys, starts, fy, offset = _KEYS, _STARTS, FIRST_YEAR, _DATE_OFFSET
+        row = _month_row(start.year, start.month, start.is_leap_month)
+        for row in range(row, len(keys)) if forward else range(row, -1, -1):
+            key = keys[row]
+            yield fy + (key >> 5), key >> 1 & 15, key & 1 == 1, starts[row] + offset, starts[row + 1] - starts[row]
+
+    @classmethod
+    def _check_vectorized(cls) -> NoReturn:
+        """
+        批量转换直接使用 ``FastCCD`` 的数据表和农历日序数，不适用于子类（比如按天文算法计算的 ``EphemCCD`` ）。
+
+        :raise TypeError: 在 ``FastCCD`` 的子类上调用。
+        """
+        if cls is not FastCCD:
+            raise TypeError(
+                f'{cls.__qualname__} 不支持批量转换，请使用 FastCCD 。'
+            )
+
+    @classmethod
+    def from_dates(cls, dates, strict: bool = True):
+        """
+        将一组公历日期批量转换为农历日期。需要安装 NumPy 后才可用。
+
+        :param dates: ``datetime64`` 数组，或者 ``datetime.date`` 组成的序列。
+        :param strict: 为假时不抛出异常，而是返回遮盖了超出范围的项的掩码数组。
+        :return: 结构化数组，字段依次为 year、month、day、is_leap。
+        :raise TypeError: 在 ``FastCCD`` 的子类上调用。
+        :raise OverflowError: 公历日期超出农历算法转换范围。
+        """
+        cls._check_vectorized()
+        from ccd.vectorized import from_dates
+        return from_dates(dates, strict)
+
+    @classmethod
+    def from_ordinals(cls, ordinals, strict: bool = True):
+        """
+        将一组农历日序数批量转换为农历日期。需要安装 NumPy 后才可用。
+
+        :param ordinals: 农历日序数组成的整数数组。
+        :param strict: 为假时不抛出异常，而是返回遮盖了超出范围的项的掩码数组。
+        :return: 结构化数组，字段依次为 year、month、day、is_leap。
+        :raise TypeError: 在 ``FastCCD`` 的子类上调用。
+        :raise OverflowError: 序数超出农历日期范围。
+        """
+        cls._check_vectorized()
+        from ccd.vectorized import from_ordinals
+        return from_ordinals(ordinals, strict)
+
+    @classmethod
+    def to_dates(cls, year, month=None, day=None, is_leap=None, strict: bool = True):
+        """
+        将一组农历日期批量转换为公历日期。需要安装 NumPy 后才可用。
+
+        所有日期会一次性检查完毕，检查规则与构造方法一致。
+
+        :param year: 农历年份数组，或者 ``from_dates()`` 返回的结构化数组（此时忽略其余参数）。
+        :param month: 农历月份数组。
+        :param day: 农历日数组。
+        :param is_leap: 是否闰月的布尔数组。如不提供则全部视为平月。
+        :param strict: 为假时不抛出异常，而是返回遮盖了无效项的掩码数组。
+        :return: ``datetime64[D]`` 数组。
+        :raise TypeError: 参数类型有误，或者在 ``FastCCD`` 的子类上调用。
+        :raise ValueError: 存在无效的日期，异常信息中会列出这些项的下标。
+        :raise OverflowError: 存在超出计算范围的日期，异常信息中会列出这些项的下标。
+        """
+        cls._check_vectorized()
+        from ccd.vectorized import to_dates
+        return to_dates(year, month, day, is_leap, strict)
+
+    @classmethod
+    def to_ordinals(cls, year, month=None, day=None, is_leap=None, strict: bool = True):
+        """
+        将一组农历日期批量转换为农历日序数。需要安装 NumPy 后才可用。
+
+        参数与 ``to_dates()`` 相同。
+
+        :return: 农历日序数组成的整数数组。
+        """
+        cls._check_vectorized()
+        from ccd.vectorized import to_ordinals
+        return to_ordinals(year, month, day, is_leap, strict)
+
+    @classmethod
+    def day_stem_branches(cls, ordinals):
+        """
+        批量求农历日序数对应的日干支。需要安装 NumPy 后才可用。
+
+        :param ordinals: 农历日序数组成的整数数组。
+        :return: 字符串数组，形状与参数相同。
+        """
+        from ccd.vectorized import day_stem_branches
+        return day_stem_branches(ordinals)
+
+    @classmethod
+    def month_stem_branches(cls, year, month):
+        """
+        批量求农历月的月干支。需要安装 NumPy 后才可用。
+
+        :param year: 农历年份组成的整数数组。
+        :param month: 农历月份组成的整数数组。闰月与所闰的月份相同。
+        :return: 字符串数组，形状为两个参数广播后的形状。
+        :raise ValueError: 农历月不在 1 到 12 之间。
+        """
+        from ccd.vectorized import month_stem_branches
+        return month_stem_branches(year, month)
+
+    @staticmethod
+    def format_many(dates: Iterable['FastCCD'], fmt: str = '农历%Y年%b月%a') -> Iterator[str]:
+        """
+        将一组农历日期按照同一格式逐个转换为字符串。格式只解析一次，可用的格式化符号与 ``strftime()`` 相同。
+
+        :param dates: 农历日期组成的可迭代对象。
+        :param fmt: 格式。
+        :return: 按需生成字符串的迭代器。
+        :raise ValueError: 格式无法解析时抛出。
+        """
+        return map(_compile_format(fmt), dates)
+
     def _replace(self, year=None, month=None, day=None, is_leap_month=None) -> Self:
         return FastCCD.__new__(
             type(self),
@@ -457,20 +989,31 @@ class FastCCD(object):
     @property
     def days_in_year(self) -> int:
         """当年总共有多少天。"""
-        return sum(inf.days for mt, inf in MONTHS.items() if mt.year == self._year)
+        lo, hi = _year_rows(self._year - FIRST_YEAR)
+        return _STARTS[hi] - _STARTS[lo]
 
     @property
     def days_in_month(self) -> int:
         """当月总共有多少天。"""
-        month = Month(self._year, self._month, self._leap)
-        return MONTHS[month].days
+        row = _month_row(self._year, self._month, self._leap)
+        return _STARTS[row + 1] - _STARTS[row]
 
     @property
     def day_of_year(self) -> int:
         """当天是自正月初一开始的第几天。"""
-        months = {mt: inf for mt, inf in MONTHS.items() if mt.year == self._year}
-        month = Month(self._year, self._month, self._leap)
-        return sum(inf.days for mt, inf in months.items() if mt < month) + self._day
+        lo, _ = _year_rows(self._year - FIRST_YEAR)
+        return self.to_ordinal() - _STARTS[lo] + 1
+
+    @property
+    def sort_key(self) -> int:
+        """
+        按先后顺序排列的整数，与农历日期一一对应，判等、比较和哈希都基于它。
+
+        按位压缩为 年(其余高位) | 月份序数(4位) | 是否闰月(1位) | 日(5位)，与数据表无关，
+        因此不同历法的农历日期也可以比较。对大量日期排序时，
+        ``sorted(dates, key=operator.attrgetter('sort_key'))`` 比直接排序更快。
+        """
+        return self._key
 
     @property
     def year_stem_branch(self) -> str:
@@ -482,8 +1025,27 @@ class FastCCD(object):
         # 农历4年是正数年份的第一个甲子年。
         # ISO 8601 约定了负数年份：0 表示公元前 1 年，1表示公元前 2 年，以此类推；
         # 负数可以被正确求余，所以这里不需要处理。
-        year = self._year - 4
-        return STEMS[year % 10] + BRANCHES[year % 12]
+        return SEXAGENARY[(self._year - 4) % 60]
+
+    @property
+    def month_stem_branch(self) -> str:
+        """
+        干支纪月法表示的农历月。
+
+        正月建寅，月干由年干推出（五虎遁），比如农历 2023 年正月对应的是 "甲寅" 。
+        按农历月而不是按节气划分，闰月与所闰的月份相同。
+        """
+        # 农历4年正月为丙寅月，此后每月依次递增
+        return SEXAGENARY[(self._year * 12 + self._month - 47) % 60]
+
+    @property
+    def day_stem_branch(self) -> str:
+        """
+        干支纪日法表示的农历日。
+
+        比如农历 2023 年正月初一对应的是 "庚辰" 。
+        """
+        return SEXAGENARY[(self.to_ordinal() + _DATE_OFFSET + _DAY_CYCLE) % 60]
 
     @property
     def year_zodiac(self) -> str:
@@ -516,39 +1078,51 @@ class FastCCD(object):
         """
         return ORDS_DAY[self._day]
 
+    def year_start(self) -> Self:
+        """
+        获取当年的第一天（正月初一）。
+
+        农历1900年的有效数据只有十二月，因此返回 ``FastCCD.MIN`` 。
+        """
+        lo, _ = _year_rows(self._year - FIRST_YEAR)
+        return self._replace(*_locate(_STARTS[lo]))
+
+    def year_end(self) -> Self:
+        """
+        获取当年的最后一天（除夕）。
+
+        农历2100年的有效数据只到十一月，因此返回 ``FastCCD.MAX`` 。
+        """
+        _, hi = _year_rows(self._year - FIRST_YEAR)
+        return self._replace(*_locate(_STARTS[hi] - 1))
+
     # 比较器
 
     def __eq__(self, other):
         if isinstance(other, FastCCD):
-            return self._cmp(other) == 0
+            return self._key == other._key
         raise NotImplementedError
 
     def __le__(self, other):
         if isinstance(other, FastCCD):
-            return self._cmp(other) <= 0
+            return self._key <= other._key
         raise NotImplementedError
 
     def __lt__(self, other):
         if isinstance(other, FastCCD):
-            return self._cmp(other) < 0
+            return self._key < other._key
         raise NotImplementedError
 
     def __ge__(self, other):
         if isinstance(other, FastCCD):
-            return self._cmp(other) >= 0
+            return self._key >= other._key
         raise NotImplementedError
 
     def __gt__(self, other):
         if isinstance(other, FastCCD):
-            return self._cmp(other) > 0
+            return self._key > other._key
         raise NotImplementedError
 
-    def _cmp(self, other):
-        assert isinstance(other, FastCCD)
-        x = self.timetuple()
-        y = other.timetuple()
-        return 0 if x == y else 1 if x > y else -1
-
     # 计算方法
 
     def __add__(self, other):
@@ -566,7 +1140,7 @@ class FastCCD(object):
             return self._replace()
         if delta < 0:
             return self.__sub__(-other)
-        return self.from_ordinal(self.to_ordinal() + delta)
+        return self._shift(delta)
 
     __radd__ = __add__
 
@@ -585,17 +1159,44 @@ class FastCCD(object):
             return self.replace()
         if delta < 0:
             return self.__add__(-other)
-        return self.from_ordinal(self.to_ordinal() - delta)
+        return self._shift(-delta)
+
+    def _shift(self, delta: int) -> Self:
+        """
+        求 delta 天之后（为负数时是之前）的农历日期。
+
+        从当前月份开始按每月天数逐月推算，跨越超过 ``_STEP_MONTHS`` 个月时才按序数重新查找，
+        因此加减较小的天数只需要常数时间。
+        """
+        row = _month_row(self._year, self._month, self._leap)
+        start = _STARTS[row]
+        n = start + self._day - 1 + delta
+        if start <= n < _STARTS[row + 1]:
+            return self._from_fields(self._year, self._month, n - start + 1, self._leap)
+        if not CCD_ORDINAL_MIN <= n <= CCD_ORDINAL_MAX:
+            raise OverflowError(
+                '超出农历日期范围。'
+            )
+        for _ in range(_STEP_MONTHS):
+            if n < _STARTS[row]:
+                row -= 1
+            elif n >= _STARTS[row + 1]:
+                row += 1
+            else:
+                break
+        else:
+            if not _STARTS[row] <= n < _STARTS[row + 1]:
+                return self._from_fields(*_locate(n))
+        key = _KEYS[row]
+        return self._from_fields(FIRST_YEAR + (key >> 5), key >> 1 & 15, n - _STARTS[row] + 1, key & 1 == 1)
 
     # 转换器
 
     def __hash__(self):
-        if self._hashcode == -1:
-            yhi, ylo = divmod(self._year, 256)
-            mon = self._month | (128 if self._leap else 0)
-            code = bytes([yhi, ylo, mon, self._day])
-            self._hashcode = hash(code)
-        return self._hashcode
+        return hash(self._key)
+
+    def __reduce__(self):
+        return _unpickle, (type(self), self._key)
 
     def __repr__(self):
         return '%s.%s(%d, %d, %d, %s)' % (
@@ -637,27 +1238,98 @@ class FastCCD(object):
         :return: 格式化后产生的字符串。
         :raise ValueError: 格式无法解析时抛出。
         """
-        return ''.join(_strftime(self, fmt))
+        return _compile_format(fmt)(self)
 
     def to_date(self) -> date:
         """将当前的农历日期转换为公历日期。"""
-        month = Month(self._year, self._month, self._leap)
-        return MONTHS[month].start + timedelta(days=self._day - 1)
+        return date.fromordinal(self.to_ordinal() + _DATE_OFFSET)
 
     def to_ordinal(self) -> int:
-        month = Month(self._year, self._month, self._leap)
-        return MONTHS[month].ordinal + self._day - 1
+        row = _month_row(self._year, self._month, self._leap)
+        return _STARTS[row] + self._day - 1
 
     toordinal = to_ordinal
 
 
-FastCCD.MIN = FastCCD(*CCD_MIN)
+def _pack_key(y, m, d, leap) -> int:
+    """将由年、月、日、是否闰月组成的元组压缩为 ``FastCCD.sort_key`` 。"""
+    return y << 10 | m << 6 | leap << 5 | d
+
+
+def _unpack_key(key: int) -> tuple:
+    """将 ``FastCCD.sort_key`` 还原为由年、月、日、是否闰月组成的元组。"""
+    return key >> 10, key >> 6 & 15, key & 31, key & 32 == 32
+
+
+def _unpickle(cls, key: int) -> FastCCD:
+    """``FastCCD.__reduce__()`` 的还原函数。日期在序列化之前已经检查过，不再重复检查。"""
+    if not _LOADED:
+        _load_tables()
+    return cls._from_fields(*_unpack_key(key))
+
+
+def pack_dates(dates: Iterable[FastCCD]) -> bytes:
+    """
+    将一组农历日期打包为紧凑的二进制数据。
+
+    每个日期占 4 字节，即小端序的 ``sort_key`` 。比逐个 pickle 农历日期更小、更快，适合在进程或网络之间传递大量日期。
+
+    :param dates: 农历日期组成的可迭代对象。
+    :return: 二进制数据。
+    """
+    keys = array('i', [d._key for d in dates])
+    if sys.byteorder != 'little':
+        keys.byteswap()
+    return keys.tobytes()
+
+
+def unpack_dates(data, cls: type[FastCCD] = None, check: bool = True) -> list[FastCCD]:
+    """
+    将 ``pack_dates()`` 打包的二进制数据还原为农历日期。
+
+    :param data: 二进制数据，可以是 bytes 或其它 bytes-like 对象。
+    :param cls: 农历日期类型。如不提供则使用 ``FastCCD`` 。
+    :param check: 是否检查日期是否存在。数据来自可信的来源（比如本程序的其它进程）时可以关闭，以免重复检查。
+    :return: 农历日期组成的列表。
+    :raise ValueError: 数据长度不是 4 的整数倍，或者日期不存在。
+    :raise OverflowError: 日期超出计算范围。
+    """
+    cls = FastCCD if cls is None else cls
+    if len(data) % 4:
+        raise ValueError(
+            '数据长度必须是 4 的整数倍。'
+        )
+    keys = array('i', data)
+    if sys.byteorder != 'little':
+        keys.byteswap()
+    if check:
+        return [cls(*_unpack_key(key)) for key in keys]
+    if not _LOADED:
+        _load_tables()
+    make = cls._from_fields
+    return [make(*_unpack_key(key)) for key in keys]
+
+
+class _LazyBound(object):
+    """首次访问时才构造的 ``FastCCD`` 类属性，构造后替换自身。"""
+
+    def __init__(self, name, fields):
+        self._name = name
+        self._fields = fields
+
+    def __get__(self, instance, owner):
+        value = FastCCD(*self._fields)
+        setattr(FastCCD, self._name, value)
+        return value
+
+
+FastCCD.MIN = _LazyBound('MIN', CCD_MIN)
 """
 当前模块支持计算的最早的农历日期。\n
 因为数据没有显示农历1900年十一月是不是闰月，故舍弃。
 """
 
-FastCCD.MAX = FastCCD(*CCD_MAX)
+FastCCD.MAX = _LazyBound('MAX', CCD_MAX)
 """
 当前模块支持计算的最晚的农历日期。\n
 因为数据没有显示农历2100年十二月是大月还是小月，故舍弃。
@@ -672,3 +1344,17 @@ if __name__ == '__main__':
     ccd = FastCCD.fromordinal(CCD_ORDINAL_MAX)
     assert ccd.timetuple() == CCD_MAX
     assert ccd.toordinal() == CCD_ORDINAL_MAX
+
+    # 最后一个有效农历月是闰月时，所闰平月的每一天都应在范围内
+    use_table(Table(DATAS, FIRST_YEAR, DATE_MIN, (1900, 12, False), (2033, 11, True)))
+    assert CCD_MAX == (2033, 11, 29, True)
+    assert FastCCD(2033, 11, 30).timetuple() == (2033, 11, 30, False)
+    for n in range(CCD_ORDINAL_MAX - 60, CCD_ORDINAL_MAX + 1):
+        assert FastCCD.from_ordinal(n).to_ordinal() == n
+    try:
+        FastCCD(2033, 12, 1)
+    except OverflowError:
+        pass
+    else:
+        raise AssertionError('没有抛出 OverflowError')
+    use_table()
@@ -0,0 +1,206 @@
+"""
+历法计算结果的缓存。
+"""
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, NoReturn
+
+
+def default_directory() -> str:
+    """
+    默认的缓存目录。
+
+    优先使用环境变量 ``CCD_CACHE_DIR`` ，否则使用 ``$XDG_CACHE_HOME/ccd`` 或 ``~/.cache/ccd`` 。
+    """
+    if directory := os.environ.get('CCD_CACHE_DIR'):
+        return directory
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'ccd')
+
+
+class _Flight(object):
+    """正在进行的一次计算。其它线程等待它完成后直接使用其结果。"""
+    __slots__ = 'done', 'value', 'error'
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class LRUCache(object):
+    """
+    容量有限的内存缓存，超出容量时淘汰最久未使用的项。线程安全。
+
+    多个线程同时查找同一个没有缓存的键时，只有一个线程进行计算，其余线程等待并共享其结果；
+    不同的键互不阻塞，可以同时计算。
+
+    缓存的值会被所有调用方共享，请勿修改。
+    """
+
+    def __init__(self, capacity: int = 128):
+        """
+        :param capacity: 最多缓存多少项。为 0 时不缓存任何数据。
+        """
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._flights: dict[Any, _Flight] = {}  # 正在计算的键
+        self._capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.waits = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    @property
+    def capacity(self) -> int:
+        """最多缓存多少项。调小时会立即淘汰多出的项。"""
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, value: int):
+        if not isinstance(value, int) or value < 0:
+            raise ValueError('capacity 必须是非负整数。')
+        with self._lock:
+            self._capacity = value
+            self._evict()
+
+    def _evict(self):
+        while len(self._data) > self._capacity:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def lookup(self, key, func: Callable[..., Any], *args) -> Any:
+        """
+        获取缓存的值。没有缓存时调用 ``func(*args)`` 计算并缓存其结果。
+
+        其它线程正在计算同一个键时，等待其完成并返回同一个结果；计算出错时，等待的线程也会抛出同一个异常。
+        计算过程中不能再查找同一个键，否则会一直等待下去。
+
+        :param key: 缓存的键。
+        :param func: 计算函数。
+        :param args: 计算函数的参数。
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                if (flight := self._flights.get(key)) is None:
+                    flight = self._flights[key] = _Flight()
+                    self.misses += 1
+                    leader = True
+                else:
+                    self.waits += 1
+                    leader = False
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = func(*args)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if flight.error is None and self._capacity:
+                    self._data[key] = flight.value
+                    self._evict()
+                del self._flights[key]
+            flight.done.set()
+        return flight.value
+
+    def clear(self) -> NoReturn:
+        """清空缓存及统计数据。"""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = self.waits = 0
+
+    def stats(self) -> dict:
+        """获取统计数据，包括命中、未命中、等待其它线程计算、淘汰的次数，以及当前缓存项数和容量。"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'waits': self.waits,
+                'evictions': self.evictions,
+                'size': len(self._data),
+                'capacity': self._capacity,
+            }
+
+
+class MonthStore(object):
+    """
+    农历月数据的持久化缓存，以 SQLite 数据库文件保存在指定目录下。
+
+    每条记录以 (算法版本, 时区偏移秒数, 公历年) 为键，
+    值是当年枚举出的所有农历月，算法版本或时区偏移不同的记录互不干扰。
+    可以被多个线程、多个进程同时使用。
+    """
+    FILENAME = 'months.sqlite3'
+
+    def __init__(self, directory=None):
+        """
+        :param directory: 缓存目录，不存在时会自动创建。如不提供则使用 ``default_directory()`` 。
+        """
+        directory = default_directory() if directory is None else os.fspath(directory)
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, self.FILENAME)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False,
+        )
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS months ('
+                ' version TEXT NOT NULL,'
+                ' delta INTEGER NOT NULL,'
+                ' year INTEGER NOT NULL,'
+                ' data TEXT NOT NULL,'
+                ' PRIMARY KEY (version, delta, year))'
+            )
+
+    def get(self, version: str, delta: int, year: int) -> list | None:
+        """
+        读取一条记录。
+
+        :return: 写入时的数据。没有这条记录时返回 ``None`` 。
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data FROM months WHERE version = ? AND delta = ? AND year = ?',
+                (version, delta, year),
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, version: str, delta: int, year: int, data: list) -> NoReturn:
+        """写入一条记录，已有的记录会被覆盖。"""
+        text = json.dumps(data, separators=(',', ':'))
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO months (version, delta, year, data) VALUES (?, ?, ?, ?)',
+                (version, delta, year, text),
+            )
+
+    def clear(self) -> NoReturn:
+        """删除所有记录。"""
+        with self._lock:
+            self._conn.execute('DELETE FROM months')
+
+    def close(self) -> NoReturn:
+        with self._lock:
+            self._conn.close()
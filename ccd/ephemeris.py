@@ -1,16 +1,40 @@
 import math
+import threading
 from collections import OrderedDict
 from datetime import date, timedelta, datetime, time
-from typing import NoReturn, NamedTuple, Self, TypeAlias
+from typing import Callable, Iterable, Iterator, NoReturn, NamedTuple, Self, TypeAlias
 
 import ephem
 
 from ccd.base import (
     FastCCD,
+    SEXAGENARY,
+    _DAY_CYCLE,
+    _STEP_MONTHS,
     _check_date_fields,
 )
+from ccd.cache import LRUCache, MonthStore
 
 DELTA = timedelta(hours=8)  # 零时区和东八区的时差
+ALGORITHM = 2  # 枚举农历月的算法版本。修改算法后需要递增，使持久化缓存中的旧数据失效。
+
+ENUM_CACHE = LRUCache(256)
+"""``_enum_months()`` 的内存缓存，以 (时区偏移, 公历年) 为键。"""
+
+YEAR_CACHE = LRUCache(256)
+"""``_get_months()`` 的内存缓存，以 (时区偏移, 农历年) 为键。"""
+
+TERM_CACHE = LRUCache(256)
+"""``_get_terms()`` 的内存缓存，以 (时区偏移, 公历年) 为键。"""
+
+_STORE: MonthStore | None = None
+
+# ephem（libastro）内部有全局状态，多个线程同时计算会得到错误的结果，所以所有 ephem 计算都要持有这个锁。
+# 有 GIL 时这些计算本来也不能并行，加锁几乎没有额外开销；缓存的查找与等待则不受这个锁限制。
+_EPHEM_LOCK = threading.Lock()
+
+# 异步方法进行计算时所使用的执行器，为 None 时使用事件循环的默认执行器
+_EXECUTOR = None
 
 
 class Month(NamedTuple):
@@ -27,6 +51,11 @@ class MonthInfo(NamedTuple):
     days: int
 
 
+def _local_date(_time: ephem.Date) -> date:
+    """求某个时刻在东八区下的日期。"""
+    return (_time.datetime() + DELTA).date()
+
+
 def _calc(_time, epoch) -> ephem.Angle:
     """
     求太阳某个时刻的地心视黄经。
@@ -58,70 +87,237 @@ def _check_if_leap(prev_date: date,
     return pd == nd and pm != 0 != nm
 
 
+def _term_time(year: int, index: int) -> ephem.Date:
+    """
+    求公历某年第 index 个节气（从小寒开始）的时刻，即太阳地心视黄经到达 285° + 15° * index 的时刻。
+    """
+    lon = (285 + 15 * index) % 360
+    # 从节气大致所在的日期开始，按太阳的平均角速度迭代逼近
+    _time = ephem.Date(date(year, index // 2 + 1, 6 + index % 2 * 15))
+    for _ in range(10):
+        diff = (lon - _calc(_time, epoch=_time) + 180) % 360 - 180
+        _time = ephem.Date(_time + diff / 360 * 365.2422)
+        if abs(diff) < 1e-7:
+            break
+    return _time
+
+
+def _calc_terms(year: int) -> tuple[date, ...]:
+    """
+    使用 ephem 计算公历某年 24 个节气在东八区下的日期。
+    """
+    with _EPHEM_LOCK:
+        return tuple(_local_date(_term_time(year, i)) for i in range(24))
+
+
+def _get_terms(year: int) -> tuple[date, ...]:
+    """
+    获取公历某年 24 个节气在东八区下的日期，从小寒开始，到冬至结束。
+    """
+    return TERM_CACHE.lookup((DELTA, year), _calc_terms, year)
+
+
+def disk_cache(enable: bool = True, directory=None) -> MonthStore | None:
+    """
+    启用或停用 ``_enum_months()`` 的持久化缓存。
+
+    启用后，每个公历年枚举出的农历月会保存到磁盘上，
+    之后（包括重启进程后）再次需要时直接读取，不再调用 ephem 计算。默认停用。
+
+    :param enable: 是否启用。
+    :param directory: 缓存目录。如不提供则使用 ``ccd.cache.default_directory()`` 。
+    :return: 启用时返回所使用的 ``MonthStore`` ，停用时返回 ``None`` 。
+    """
+    global _STORE
+    if _STORE is not None:
+        _STORE.close()
+        _STORE = None
+    if enable:
+        _STORE = MonthStore(directory)
+    return _STORE
+
+
+def async_executor(executor=None) -> NoReturn:
+    """
+    设置 ``EphemCCD`` 的异步方法（ ``afrom_date()`` 等）进行计算时所使用的执行器。
+
+    计算结果保存在当前进程的缓存中，所以应当使用线程池，比如 ``concurrent.futures.ThreadPoolExecutor`` 。
+
+    :param executor: 执行器。如不提供则使用事件循环的默认执行器。
+    """
+    global _EXECUTOR
+    _EXECUTOR = executor
+
+
+async def _offload(func: Callable, *args):
+    """在执行器中调用 ``func(*args)`` ，不阻塞事件循环。"""
+    import asyncio  # asyncio 导入较慢，只在需要时导入
+    return await asyncio.get_running_loop().run_in_executor(_EXECUTOR, func, *args)
+
+
+def _gregorian_ready(year) -> bool:
+    """转换公历 year 年内的日期所需的数据是否都已在内存缓存中。"""
+    return (
+        (DELTA, year) in ENUM_CACHE and (DELTA, year + 1) in ENUM_CACHE and
+        (DELTA, year - 1) in YEAR_CACHE and (DELTA, year) in YEAR_CACHE
+    )
+
+
+def _gregorian_warm(year) -> NoReturn:
+    """计算并缓存转换公历 year 年内的日期所需的数据，之后 ``_gregorian_ready(year)`` 成立。"""
+    _get_months(year - 1)
+    _get_months(year)
+
+
+def _lunar_ready(year) -> bool:
+    """农历 year 年的月份是否已在内存缓存中。"""
+    return (DELTA, year) in YEAR_CACHE
+
+
+async def _abatch(items: Iterable, group: Callable, ready: Callable, warm: Callable, convert: Callable) -> list:
+    """
+    按年份分组逐个转换。所需数据已在内存缓存中的组直接转换，其余各组同时在执行器中计算并转换。
+
+    :param group: 求每一项所属的年份。返回 None 表示直接转换（比如参数类型有误，由 convert 抛出异常）。
+    :param ready: 判断某年所需的数据是否都已在内存缓存中。
+    :param warm: 计算并缓存某年所需的数据。
+    :param convert: 转换函数。
+    :return: 按参数顺序排列的转换结果。
+    """
+    items = list(items)
+    results = [None] * len(items)
+    groups: dict = {}
+    for i, item in enumerate(items):
+        groups.setdefault(group(item), []).append(i)
+
+    def run(indexes, year=None):
+        if year is not None:
+            warm(year)
+        for i in indexes:
+            results[i] = convert(items[i])
+
+    pending = []
+    for year, indexes in groups.items():
+        if year is None or ready(year):
+            run(indexes)
+        else:
+            pending.append((indexes, year))
+    if pending:
+        import asyncio
+        await asyncio.gather(*(_offload(run, indexes, year) for indexes, year in pending))
+    return results
+
+
+def _store_key(year: int) -> tuple[str, int, int]:
+    return f'{ALGORITHM}/{ephem.__version__}', int(DELTA.total_seconds()), year
+
+
 def _enum_months(year: int) -> OrderedDict[Month, MonthInfo]:
     """
     枚举公历年去年冬至所在月份（农历十一月）至
-    公历当年冬至前一个月份（农历十月/闰十月）之间的所有农历月。
+    公历当年冬至前一个月份（农历十月/闰十月）之间的所有农历月。\n
+    结果会被缓存并共享，请勿修改。
     """
-    # 获取去年和今年的冬至（Winter Solstice）
-    pws = ephem.previous_solstice(str(year))
-    nws = ephem.previous_solstice(str(year + 1))
-
-    # 求出每个月的初一（从去年冬至前的朔日到今年冬至前的朔日）
-    starts: list[date] = []
-    start: ephem.Date = ephem.previous_new_moon(pws)
-    while start < nws:
-        starts.append((start.datetime() + DELTA).date())  # 转换为东八区当天凌晨零点
-        start = ephem.next_new_moon(start)
+    return ENUM_CACHE.lookup((DELTA, year), _load_months, year)
 
-    mos = (11, 12, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10)  # (month-ordinal)s
-    tags = (False,) * 12  # (is_leap_month)s
 
-    # 合朔12次则不置闰
-    if (times := len(starts) - 1) == 12:
+def _load_months(year: int) -> OrderedDict[Month, MonthInfo]:
+    """
+    从持久化缓存中读取 ``_enum_months()`` 的结果，没有启用或没有缓存时调用 ephem 计算。
+    """
+    if _STORE is None:
+        return _calc_months(year)
+    key = _store_key(year)
+    if (rows := _STORE.get(*key)) is not None:
         return OrderedDict(
-            (
-                Month(mos[i], False),
-                MonthInfo(starts[i], (starts[i + 1] - starts[i]).days)
-            )
-            for i in range(times)
+            (Month(ords, leap), MonthInfo(date.fromordinal(start), days))
+            for ords, leap, start, days in rows
         )
+    months = _calc_months(year)
+    _STORE.put(*key, [
+        (month.ords, month.is_leap, info.start.toordinal(), info.days)
+        for month, info in months.items()
+    ])
+    return months
 
-    # 合朔超过12次，闰月为冬至所在月开始的第一个无中气月
-    for i in range(times):
-        if _check_if_leap(starts[i], starts[i + 1], epoch=pws):
-            vals = (
-                MonthInfo(starts[i], (starts[i + 1] - starts[i]).days)
+
+def _calc_months(year: int) -> OrderedDict[Month, MonthInfo]:
+    """
+    使用 ephem 计算 ``_enum_months()`` 的结果。
+    """
+    with _EPHEM_LOCK:
+        # 获取去年和今年的冬至（Winter Solstice）
+        pws = ephem.previous_solstice(str(year))
+        nws = ephem.previous_solstice(str(year + 1))
+
+        # 求出每个月的初一（从去年冬至所在月的朔日到今年冬至所在月的朔日）。
+        # 朔日与冬至按东八区的日期比较，二者同一天时，冬至属于从这一天开始的农历月。
+        starts: list[date] = []
+        start: ephem.Date = ephem.previous_new_moon(pws)
+        if _local_date(ephem.next_new_moon(pws)) == _local_date(pws):
+            start = ephem.next_new_moon(pws)
+        while (local := _local_date(start)) <= _local_date(nws):
+            starts.append(local)
+            start = ephem.next_new_moon(start)
+
+        mos = (11, 12, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10)  # (month-ordinal)s
+        tags = (False,) * 12  # (is_leap_month)s
+
+        # 合朔12次则不置闰
+        if (times := len(starts) - 1) == 12:
+            return OrderedDict(
+                (
+                    Month(mos[i], False),
+                    MonthInfo(starts[i], (starts[i + 1] - starts[i]).days)
+                )
                 for i in range(times)
             )
-            keys = map(Month.fromtuple, zip(
-                mos[:i] + (mos[i - 1],) + mos[i:],
-                tags[:i] + (True,) + tags[i:],
-            ))
-            return OrderedDict(zip(keys, vals))
-    raise RuntimeError(f'合朔超过十二次但没有找到 {year} 年的闰月。')
-
 
-def _get_months(year: int):
+        # 合朔超过12次，闰月为冬至所在月开始的第一个无中气月
+        for i in range(times):
+            if _check_if_leap(starts[i], starts[i + 1], epoch=pws):
+                vals = (
+                    MonthInfo(starts[i], (starts[i + 1] - starts[i]).days)
+                    for i in range(times)
+                )
+                keys = map(Month.fromtuple, zip(
+                    mos[:i] + (mos[i - 1],) + mos[i:],
+                    tags[:i] + (True,) + tags[i:],
+                ))
+                return OrderedDict(zip(keys, vals))
+        raise RuntimeError(f'合朔超过十二次但没有找到 {year} 年的闰月。')
+
+
+def _get_months(year: int) -> OrderedDict[Month, MonthInfo]:
     """
-    获取当前农历年的所有月份。
+    获取当前农历年的所有月份。\n
+    结果会被缓存并共享，请勿修改。
     """
+    return YEAR_CACHE.lookup((DELTA, year), _join_months, year)
+
+
+def _join_months(year: int) -> OrderedDict[Month, MonthInfo]:
     _curr = _enum_months(year)
     _next = _enum_months(year + 1)
-    _curr.popitem(last=False)
-    _curr.popitem(last=False)
-    _curr.update(OrderedDict(
-        (_next.popitem(last=False),
-         _next.popitem(last=False))
-    ))
-    return _curr
+    months = OrderedDict()
+    # 正月之前的农历月（十一月、十二月，可能还有其中一个的闰月）属于上一个农历年
+    started = False
+    for month, info in _curr.items():
+        started = started or month == (1, False)
+        if started:
+            months[month] = info
+    for month, info in _next.items():
+        if month == (1, False):
+            break
+        months[month] = info
+    return months
 
 
 def _check_fields(y, m, d, leap) -> NoReturn:
     # 基础检查
     _check_date_fields(y, m, d, leap)
-    # 岁首在十一月，所以如果提供的农历月在十一月之后，就需要枚举下一个农历年的农历月。
-    months = _enum_months(y if m < 11 else (y + 1))
+    # 岁首在十一月，农历年的月份分布在相邻两个公历年枚举出的农历月中。
+    months = _get_months(y)
     prefix = '闰' if leap else ''
     if (_month := Month(m, leap)) not in months:
         raise ValueError(
@@ -142,7 +338,7 @@ class EphemCCD(FastCCD):
         self._month = month
         self._day = day
         self._leap = is_leap_month
-        self._hashcode = -1
+        self._key = year << 10 | month << 6 | is_leap_month << 5 | day
         return self
 
     @classmethod
@@ -151,19 +347,22 @@ class EphemCCD(FastCCD):
             raise TypeError(
                 '只接受 datetime.date 及其衍生类型的公历日期。'
             )
-        solstice = ephem.previous_solstice(str(_date.year)).datetime().date()
-        months = _enum_months(_date.year if solstice <= _date else (_date.year - 1))
-        last_moon = None
-        last_info = None
-        for m in months:
-            if months[m].start == _date:
-                return cls(_date.year, m.ords, 1, m.is_leap)
-            elif months[m].start < _date:
-                last_moon = m
-                last_info = months[m]
-            else:
-                day = (_date - last_info.start).days + 1
-                return cls(_date.year, last_moon.ords, day, last_moon.is_leap)
+        # 公历年 year 枚举出的农历月从去年农历十一月开始，到今年农历十一月之前结束；
+        # 今年农历十一月及之后的日期需要枚举下一年。
+        year = _date.year
+        months = _enum_months(year)
+        last = next(reversed(months.values()))
+        if last.start + timedelta(days=last.days) <= _date:
+            year += 1
+            months = _enum_months(year)
+        # 正月之前的农历十一月、十二月属于上一个农历年
+        lunar_year = year - 1
+        for m, info in months.items():
+            if m.ords == 1 and not m.is_leap:
+                lunar_year = year
+            if info.start <= _date < info.start + timedelta(days=info.days):
+                return cls(lunar_year, m.ords, (_date - info.start).days + 1, m.is_leap)
+        raise RuntimeError(f'没有找到 {_date} 所在的农历月。')
 
     @classmethod
     def from_ordinal(cls, n) -> Self:
@@ -171,6 +370,17 @@ class EphemCCD(FastCCD):
 
     fromordinal = from_ordinal
 
+    @classmethod
+    def day_stem_branches(cls, ordinals):
+        """
+        批量求日期序数对应的日干支。需要安装 NumPy 后才可用。
+
+        :param ordinals: 公历日期序数组成的整数数组，与 ``to_ordinal()`` 的结果一致。
+        :return: 字符串数组，形状与参数相同。
+        """
+        from ccd.vectorized import day_stem_branches
+        return day_stem_branches(ordinals, gregorian=True)
+
     # 只读属性
 
     @property
@@ -189,6 +399,30 @@ class EphemCCD(FastCCD):
         _month = Month(self._month, self._leap)
         return sum(info.days for m, info in months.items() if m < _month) + self._day
 
+    @property
+    def day_stem_branch(self) -> str:
+        return SEXAGENARY[(self.to_ordinal() + _DAY_CYCLE) % 60]
+
+    def year_start(self) -> Self:
+        return type(self)(self._year, 1, 1, False)
+
+    def year_end(self) -> Self:
+        month, info = next(reversed(_get_months(self._year).items()))
+        return type(self)(self._year, month.ords, info.days, month.is_leap)
+
+    @classmethod
+    def _iter_months(cls, start: 'EphemCCD', forward: bool = True) -> Iterator[tuple]:
+        # 逐个农历年取出缓存的月份表，没有范围限制
+        year = start.year
+        months = tuple(_get_months(year).items())
+        i = [month for month, _ in months].index((start.month, start.is_leap_month))
+        while True:
+            for month, info in months[i:] if forward else months[i::-1]:
+                yield year, month.ords, month.is_leap, info.start.toordinal(), info.days
+            year += 1 if forward else -1
+            months = tuple(_get_months(year).items())
+            i = 0 if forward else -1
+
     # 计算方法
 
     def __add__(self, other):
@@ -197,8 +431,7 @@ class EphemCCD(FastCCD):
                 return self.replace()
             if days < 0:
                 return self.__sub__(-other)
-            n = self.to_ordinal() + days
-            return self.from_ordinal(n)
+            return self._shift(days)
         raise NotImplementedError
 
     __radd__ = __add__
@@ -209,20 +442,47 @@ class EphemCCD(FastCCD):
                 return self.replace()
             if days < 0:
                 return self.__add__(-other)
-            n = self.to_ordinal() - days
-            assert 0 < n
-            return self.from_ordinal(n)
+            return self._shift(-days)
         elif isinstance(other, FastCCD):
             n = self.to_ordinal() - other.to_ordinal()
             assert 0 < n
             return self.from_ordinal(n)
         raise NotImplementedError
 
+    def _shift(self, delta: int) -> Self:
+        # 在缓存的农历年月份表中逐月推算，跨年时换用相邻农历年的月份表；
+        # 跨越超过 _STEP_MONTHS 个月时才按公历日期重新查找。
+        year = self._year
+        months = tuple(_get_months(year).items())
+        i = [month for month, _ in months].index((self._month, self._leap))
+        n = self._day - 1 + delta  # 距离第 i 个月月初的天数
+        for _ in range(_STEP_MONTHS):
+            if n < 0:
+                if i == 0:
+                    year -= 1
+                    months = tuple(_get_months(year).items())
+                    i = len(months)
+                i -= 1
+                n += months[i][1].days
+            elif n >= months[i][1].days:
+                n -= months[i][1].days
+                i += 1
+                if i == len(months):
+                    year += 1
+                    months = tuple(_get_months(year).items())
+                    i = 0
+            else:
+                break
+        else:
+            if not 0 <= n < months[i][1].days:
+                return self.from_date(months[i][1].start + timedelta(days=n))
+        month = months[i][0]
+        return self._from_fields(year, month.ords, n + 1, month.is_leap)
+
     # 转换器
 
     def to_date(self) -> date:
-        months = _enum_months(self._year - (0 if self._month < 11 else 1))
-        start = months[Month(self._month, self._leap)].start
+        start = _get_months(self._year)[Month(self._month, self._leap)].start
         return start + timedelta(days=self._day - 1)
 
     def to_ordinal(self) -> int:
@@ -230,5 +490,76 @@ class EphemCCD(FastCCD):
 
     toordinal = to_ordinal
 
+    # 异步方法。所需数据不在内存缓存中时，先在执行器中计算并缓存（见 async_executor()），不阻塞事件循环；
+    # 之后以及数据已在内存缓存中时直接返回结果。
+
+    @classmethod
+    async def afrom_date(cls, _date: date) -> Self:
+        """``from_date()`` 的异步版本。"""
+        if isinstance(_date, date) and not _gregorian_ready(_date.year):
+            await _offload(_gregorian_warm, _date.year)
+        return cls.from_date(_date)
+
+    @classmethod
+    async def afrom_ordinal(cls, n) -> Self:
+        """``from_ordinal()`` 的异步版本。"""
+        return await cls.afrom_date(date.fromordinal(n))
+
+    @classmethod
+    async def afrom_dates(cls, dates: Iterable[date]) -> list[Self]:
+        """
+        批量将公历日期转换为农历日期。
+
+        按公历年分组，需要计算的各组同时在执行器中转换，同一年份只计算一次。
+
+        :param dates: 公历日期组成的可迭代对象。
+        :return: 按参数顺序排列的农历日期。
+        """
+        return await _abatch(
+            dates, lambda day: day.year if isinstance(day, date) else None,
+            _gregorian_ready, _gregorian_warm, cls.from_date,
+        )
+
+    @staticmethod
+    async def ato_dates(dates: Iterable['EphemCCD']) -> list[date]:
+        """
+        批量将农历日期转换为公历日期。
+
+        按农历年分组，需要计算的各组同时在执行器中转换，同一年份只计算一次。
+
+        :param dates: 农历日期组成的可迭代对象。
+        :return: 按参数顺序排列的公历日期。
+        """
+        return await _abatch(dates, lambda day: day.year, _lunar_ready, _get_months, lambda day: day.to_date())
+
+    async def _await_year(self) -> NoReturn:
+        """确保当前农历年的月份已在内存缓存中，需要计算时在执行器中进行。"""
+        if not _lunar_ready(self._year):
+            await _offload(_get_months, self._year)
+
+    async def ato_date(self) -> date:
+        """``to_date()`` 的异步版本。"""
+        await self._await_year()
+        return self.to_date()
+
+    async def ato_ordinal(self) -> int:
+        """``to_ordinal()`` 的异步版本。"""
+        return (await self.ato_date()).toordinal()
+
+    async def adays_in_year(self) -> int:
+        """``days_in_year`` 的异步版本。"""
+        await self._await_year()
+        return self.days_in_year
+
+    async def adays_in_month(self) -> int:
+        """``days_in_month`` 的异步版本。"""
+        await self._await_year()
+        return self.days_in_month
+
+    async def aday_of_year(self) -> int:
+        """``day_of_year`` 的异步版本。"""
+        await self._await_year()
+        return self.day_of_year
+
 
 ChineseCalendarDate: TypeAlias = EphemCCD
@@ -0,0 +1,122 @@
+"""
+公农历对照的月历、年历网格。
+
+网格一次性生成并缓存，渲染日历页面时无需逐日转换。例如
+
+    from ccd.grid import month_grid
+    for week in month_grid(2023, 3):
+        print(' '.join(cell.label for cell in week))
+"""
+from datetime import date, timedelta
+from typing import NamedTuple
+
+from ccd import base
+from ccd.base import FastCCD
+from ccd.cache import LRUCache
+
+GRID_CACHE = LRUCache(128)
+"""网格的内存缓存，以 (农历日期类型, 数据表版本, 网格类型, 参数...) 为键。"""
+
+
+class Cell(NamedTuple):
+    date: date  # 公历日期
+    lunar: FastCCD | None  # 农历日期。超出农历日期类型的范围时为 None
+    label: str  # 显示的文字：月初为月份（比如“闰四月”），其余为日（比如“初二”）
+    month_start: bool  # 是否为农历月的第一天
+    in_month: bool  # 是否属于所请求的月份（月历的首尾会包含前后月份的几天）
+
+
+def _cells(cls, first: date, days: int, month=None) -> tuple[Cell, ...]:
+    """生成 first 开始连续 days 天的格子。"""
+    last = first + timedelta(days=days)
+    try:
+        pairs = list(cls.range(cls.from_date(first), cls.from_date(last), gregorian=True))
+    except OverflowError:
+        # 网格跨越了农历日期类型的范围边界，逐日转换，超出范围的格子不含农历日期
+        pairs = []
+        for i in range(days):
+            day = first + timedelta(days=i)
+            try:
+                pairs.append((cls.from_date(day), day))
+            except OverflowError:
+                pairs.append((None, day))
+    cells = []
+    for lunar, day in pairs:
+        in_month = month is None or day.month == month
+        if lunar is None:
+            cells.append(Cell(day, None, '', False, in_month))
+        elif lunar.day == 1:
+            cells.append(Cell(day, lunar, lunar.month_ordinal + '月', True, in_month))
+        else:
+            cells.append(Cell(day, lunar, lunar.day_ordinal, False, in_month))
+    return tuple(cells)
+
+
+def month_grid(year: int, month: int, cls: type[FastCCD] = FastCCD,
+               firstweekday: int = 0) -> tuple[tuple[Cell, ...], ...]:
+    """
+    获取公历某月的月历网格。
+
+    网格固定为 6 周 42 天，从包含当月 1 日的那一周开始，首尾会包含前后月份的几天。
+    结果会被缓存并共享，请勿修改。
+
+    :param year: 公历年。
+    :param month: 公历月。
+    :param cls: 农历日期类型，比如 ``FastCCD`` 或 ``EphemCCD`` 。
+    :param firstweekday: 每周的第一天，0 表示周一，6 表示周日，与标准库 calendar 一致。
+    :return: 6 行，每行 7 个格子。
+    """
+    if not 0 <= firstweekday <= 6:
+        raise ValueError('firstweekday 只能是一个从 0 到 6 的整数。')
+    key = (cls, base._GENERATION, 'month', year, month, firstweekday)
+    return GRID_CACHE.lookup(key, _month_grid, year, month, cls, firstweekday)
+
+
+def _month_grid(year, month, cls, firstweekday) -> tuple[tuple[Cell, ...], ...]:
+    first = date(year, month, 1)
+    first -= timedelta(days=(first.weekday() - firstweekday) % 7)
+    cells = _cells(cls, first, 42, month)
+    return tuple(cells[i:i + 7] for i in range(0, 42, 7))
+
+
+def year_grid(year: int, cls: type[FastCCD] = FastCCD) -> tuple[tuple[Cell, ...], ...]:
+    """
+    获取农历某年的年历。
+
+    结果会被缓存并共享，请勿修改。
+
+    :param year: 农历年。
+    :param cls: 农历日期类型，比如 ``FastCCD`` 或 ``EphemCCD`` 。
+    :return: 按先后顺序排列的每个农历月（含闰月），每个月包含当月每一天的格子。
+    :raise OverflowError: 农历年超出农历日期类型的范围。
+    """
+    key = (cls, base._GENERATION, 'year', year)
+    return GRID_CACHE.lookup(key, _year_grid, year, cls)
+
+
+def _year_grid(year, cls) -> tuple[tuple[Cell, ...], ...]:
+    try:
+        start = cls(year, 1, 1).year_start()
+    except OverflowError:
+        # 数据表的第一年可能从年中开始（比如农历1900年只有十二月），此时从第一个有效的农历月开始
+        if year != base.CCD_MIN[0]:
+            raise
+        start = cls(*base.CCD_MIN)
+    end = start.year_end()
+    first = start.to_date()
+    cells = _cells(cls, first, (end.to_date() - first).days + 1)
+    months, begin = [], 0
+    for i in range(1, len(cells) + 1):
+        if i == len(cells) or cells[i].month_start:
+            months.append(cells[begin:i])
+            begin = i
+    return tuple(months)
+
+
+if __name__ == '__main__':
+    # 数据表的第一年只有部分月份
+    months = year_grid(base.CCD_MIN[0])
+    assert len(months) == 1 and months[0][0].lunar == FastCCD.MIN
+    assert months[-1][-1].lunar == FastCCD(1901, 1, 1) - timedelta(days=1)
+    months = year_grid(2020)
+    assert len(months) == 13 and months[0][0].date == date(2020, 1, 25)
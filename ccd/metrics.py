@@ -0,0 +1,236 @@
+"""
+转换热点的调用计数与耗时统计。
+
+默认停用，停用时没有任何额外开销。启用后，热点函数和方法会被替换为带计数和计时的包装，
+停用时换回原来的函数。例如
+
+    from ccd import metrics
+    with metrics.recording() as result:
+        EphemCCD.from_date(date(2050, 1, 1))
+    print(result['calls']['ccd.ephemeris._calc_months'])
+
+也可以用 ``record()`` 长期启用，再定期调用 ``snapshot()`` 将累计数据输出到监控系统。
+"""
+import sys
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter_ns
+from typing import Callable, Iterator, NoReturn
+
+from ccd import base
+
+# 统计的函数。只统计通过模块或类的属性调用的地方，其它模块导入的引用不受影响。
+_BASE_FUNCTIONS = ('_load_tables', '_locate', '_check_date_range')
+_EPHEMERIS_FUNCTIONS = (
+    '_enum_months', '_load_months', '_calc_months', '_get_months', '_join_months',
+    '_check_fields', '_check_if_leap', '_calc', '_calc_terms',
+)
+_METHODS = (
+    '__new__', 'from_date', 'from_ordinal', 'strptime', 'replace', '_shift',
+    'to_date', 'to_ordinal', 'strftime', 'year_start', 'year_end',
+    'days_in_year', 'days_in_month', 'day_of_year',
+)
+_EPHEM_FUNCTIONS = (
+    'previous_solstice', 'previous_new_moon', 'next_new_moon', 'Sun', 'Equatorial', 'Ecliptic',
+)
+
+_LOCK = threading.Lock()
+_CALLS: dict[str, list[int]] = {}  # 函数名 -> [调用次数, 累计纳秒数]
+_EPHEM: dict[str, list[int]] = {}  # ephem 函数名 -> [调用次数, 累计纳秒数]
+_PATCHED: list[tuple[object, str, object]] = []  # (模块或类, 属性名, 原来的值)
+
+
+def _wrap(name: str, func: Callable, counters: dict) -> Callable:
+    counter = counters.setdefault(name, [0, 0])
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = perf_counter_ns() - start
+            with _LOCK:
+                counter[0] += 1
+                counter[1] += elapsed
+
+    return wrapper
+
+
+class _CountingModule(object):
+    """代替模块，统计其中部分函数的调用，其余属性原样转发。"""
+
+    def __init__(self, module, names):
+        self._module = module
+        for name in names:
+            setattr(self, name, _wrap(name, getattr(module, name), _EPHEM))
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+
+def _patch(owner, name: str, value) -> NoReturn:
+    _PATCHED.append((owner, name, vars(owner)[name]))
+    setattr(owner, name, value)
+
+
+def _patch_functions(module, names) -> NoReturn:
+    for name in names:
+        _patch(module, name, _wrap(f'{module.__name__}.{name}', getattr(module, name), _CALLS))
+
+
+def _patch_methods(cls) -> NoReturn:
+    for name in _METHODS:
+        if (attr := cls.__dict__.get(name)) is None:
+            continue
+        title = f'{cls.__name__}.{name}'
+        if isinstance(attr, property):
+            value = property(_wrap(title, attr.fget, _CALLS), doc=attr.__doc__)
+        elif isinstance(attr, classmethod):
+            value = classmethod(_wrap(title, attr.__func__, _CALLS))
+        elif isinstance(attr, staticmethod):  # __new__
+            value = staticmethod(_wrap(title, attr.__func__, _CALLS))
+        else:
+            value = _wrap(title, attr, _CALLS)
+        _patch(cls, name, value)
+
+
+def _ephemeris():
+    try:
+        from ccd import ephemeris
+    except ImportError:
+        return None
+    return ephemeris
+
+
+def record(enable: bool = True) -> NoReturn:
+    """
+    启用或停用统计。默认停用。
+
+    启用时会导入 ``ccd.ephemeris`` （如果已安装 ephem），从而能统计 ``EphemCCD`` 及其调用的 ephem 函数。
+    启停不会清空已经累计的数据，需要时请调用 ``reset()`` 。
+
+    :param enable: 是否启用。
+    """
+    if bool(enable) == bool(_PATCHED):
+        return
+    if not enable:
+        while _PATCHED:
+            owner, name, value = _PATCHED.pop()
+            setattr(owner, name, value)
+        return
+    _patch_functions(base, _BASE_FUNCTIONS)
+    _patch_methods(base.FastCCD)
+    if (ephemeris := _ephemeris()) is not None:
+        _patch_functions(ephemeris, _EPHEMERIS_FUNCTIONS)
+        _patch_methods(ephemeris.EphemCCD)
+        _patch(ephemeris, 'ephem', _CountingModule(ephemeris.ephem, _EPHEM_FUNCTIONS))
+
+
+def is_recording() -> bool:
+    """是否已经启用统计。"""
+    return bool(_PATCHED)
+
+
+def reset() -> NoReturn:
+    """清空累计的调用次数和耗时。缓存的命中统计由各个缓存自行维护，不受影响。"""
+    with _LOCK:
+        for counter in (*_CALLS.values(), *_EPHEM.values()):
+            counter[0] = counter[1] = 0
+
+
+def _caches() -> Iterator[tuple[str, dict]]:
+    for name in ('_compile_format', '_get_parser'):
+        info = getattr(base, name).cache_info()
+        yield f'ccd.base.{name}', {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'capacity': info.maxsize,
+        }
+    # 只统计已经导入的模块中的缓存，避免为了统计而导入 ephem
+    if (ephemeris := sys.modules.get('ccd.ephemeris')) is not None:
+        yield 'ccd.ephemeris.ENUM_CACHE', ephemeris.ENUM_CACHE.stats()
+        yield 'ccd.ephemeris.YEAR_CACHE', ephemeris.YEAR_CACHE.stats()
+        yield 'ccd.ephemeris.TERM_CACHE', ephemeris.TERM_CACHE.stats()
+    if (grid := sys.modules.get('ccd.grid')) is not None:
+        yield 'ccd.grid.GRID_CACHE', grid.GRID_CACHE.stats()
+
+
+def _hit_rate(stats: dict) -> dict:
+    total = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / total if total else None
+    return stats
+
+
+def snapshot() -> dict:
+    """
+    获取累计的统计数据。
+
+    返回的字典包含以下几项：
+
+    - ``'recording'`` ，是否正在统计。
+    - ``'calls'`` ，各个函数的调用次数 ``'calls'`` 和累计耗时 ``'seconds'`` ，
+      以 ``'ccd.ephemeris._calc'`` 或 ``'EphemCCD.from_date'`` 的形式命名。
+      耗时包含其中调用的其它函数；继承的方法计入定义它的类。
+    - ``'ephem'`` ，ephem 中各个函数（或类）的调用次数和累计耗时，格式同上。
+    - ``'caches'`` ，各个缓存的命中次数 ``'hits'`` 、未命中次数 ``'misses'`` 、命中率 ``'hit_rate'`` 等。
+      这部分由缓存自行统计，不需要启用也有数据。
+
+    :return: 可以直接序列化为 JSON 的字典。
+    """
+    with _LOCK:
+        calls = {name: {'calls': n, 'seconds': ns / 1e9} for name, (n, ns) in _CALLS.items() if n}
+        ephem = {name: {'calls': n, 'seconds': ns / 1e9} for name, (n, ns) in _EPHEM.items() if n}
+    return {
+        'recording': is_recording(),
+        'calls': calls,
+        'ephem': ephem,
+        'caches': {name: _hit_rate(stats) for name, stats in _caches()},
+    }
+
+
+def _diff(after: dict, before: dict) -> dict:
+    result = {}
+    for name, item in after.items():
+        prev = before.get(name, {})
+        item = {key: value - prev.get(key, 0) for key, value in item.items()}
+        if item['calls']:
+            result[name] = item
+    return result
+
+
+@contextmanager
+def recording() -> Iterator[dict]:
+    """
+    在一段代码中临时启用统计。
+
+    得到的字典在退出时填充这段代码期间的统计数据，包含 ``'calls'`` 、 ``'ephem'`` 、 ``'caches'`` 三项，
+    格式与 ``snapshot()`` 相同，但次数和耗时只包含这段期间新增的部分（其它线程同时进行的调用也会计入）。
+    缓存的容量 ``'capacity'`` 和当前项数 ``'size'`` 为退出时的值。
+    退出后恢复进入前的启停状态。
+    """
+    enabled = is_recording()
+    record()
+    result = {}
+    before = snapshot()
+    try:
+        yield result
+    finally:
+        after = snapshot()
+        if not enabled:
+            record(False)
+        caches = {}
+        for name, stats in after['caches'].items():
+            prev = before['caches'].get(name, {})
+            stats = stats | {
+                key: stats[key] - prev.get(key, 0)
+                for key in ('hits', 'misses', 'waits', 'evictions') if key in stats
+            }
+            caches[name] = _hit_rate(stats)
+        result.update({
+            'calls': _diff(after['calls'], before['calls']),
+            'ephem': _diff(after['ephem'], before['ephem']),
+            'caches': caches,
+        })
@@ -0,0 +1,168 @@
+"""
+二十四节气。
+
+公历 1901 年至 2100 年的节气日期内置于 ``TERM_DATAS`` ，由 ephem 计算生成（见 ``ccd.tablegen`` ），
+查询时只需读取一次数据；其它年份需要安装 PyEphem ，首次查询时计算并缓存。
+节气的日期均为东八区下的日期。例如
+
+    from ccd.solarterms import TERMS, term_date, term_on
+    term_date(2023, 2)  # date(2023, 2, 4)，立春
+    TERMS[term_on(date(2022, 12, 22))]  # '冬至'
+"""
+from datetime import date
+
+TERMS = (
+    '小寒', '大寒', '立春', '雨水', '惊蛰', '春分', '清明', '谷雨', '立夏', '小满', '芒种', '夏至',
+    '小暑', '大暑', '立秋', '处暑', '白露', '秋分', '寒露', '霜降', '立冬', '小雪', '大雪', '冬至',
+)
+"""按公历年内的先后顺序排列的节气名称。第 i 个节气在公历 i // 2 + 1 月。"""
+
+TERM_FIRST_YEAR = 1901  # TERM_DATAS[0] 对应的公历年
+TERM_LAST_YEAR = 2100  # TERM_DATAS[-1] 对应的公历年
+TERM_BASE = (4, 19, 3, 18, 4, 19, 4, 19, 4, 20, 4, 20, 6, 22, 6, 22, 6, 22, 7, 22, 6, 21, 6, 21)
+"""每个节气在内置数据范围内最早的日（当月第几天）。"""
+
+# 每年一项。第 2i 至 2i+1 位表示第 i 个节气的日与 TERM_BASE[i] 之差（0 至 3）。
+TERM_DATAS = (
+    0x6aaaa6aa9a5a, 0xaaaaaabaaa6a, 0xaaabbabbafaa, 0x5aa665a65aab, 0x6aaaa6aa9a5a,  # 1901-1905
+    0xaaaaaaaaaa6a, 0xaaabbabbafaa, 0x5aa665a65aab, 0x6aaaa6aa9a5a, 0xaaaaaaaaaa6a,  # 1906-1910
+    0xaaabbabbafaa, 0x56a665a65aab, 0x6aa6a6aa9a56, 0xaaaaaaaa9a5a, 0xaaabaabaaeaa,  # 1911-1915
+    0x569665a65aaa, 0x6aa6a6a69a56, 0x6aaaaaaa9a5a, 0xaaabaabaaeaa, 0x569665a65aaa,  # 1916-1920
+    0x5aa6a6a65a56, 0x6aaaaaaa9a5a, 0xaaabaabaaa6a, 0x569665a65aaa, 0x5aa6a6a65a56,  # 1921-1925
+    0x6aaaa6aa9a5a, 0xaaabaabaaa6a, 0x555665a65aaa, 0x5aa665a65a56, 0x6aaaa6aa9a5a,  # 1926-1930
+    0xaaaaaabaaa6a, 0x555665665aaa, 0x5aa665a65a56, 0x6aaaa6aa9a5a, 0xaaaaaaaaaa6a,  # 1931-1935
+    0x555665665aaa, 0x5aa665a65a56, 0x6aaaa6aa9a5a, 0xaaaaaaaaaa6a, 0x555665665aaa,  # 1936-1940
+    0x5aa665a65a56, 0x6aaaa6aa9a5a, 0xaaaaaaaaaa6a, 0x555665655aaa, 0x569665a65a56,  # 1941-1945
+    0x6aa6a6aa9a56, 0xaaaaaaaa9a5a, 0x5556556559aa, 0x569665a65a55, 0x6aa6a6a65a56,  # 1946-1950
+    0x6aaaaaaa9a5a, 0x5556556559aa, 0x569665a65a55, 0x5aa6a6a65a56, 0x6aaaa6aa9a5a,  # 1951-1955
+    0x5556556555aa, 0x569665a65a55, 0x5aa665a65a56, 0x6aaaa6aa9a5a, 0x55555565556a,  # 1956-1960
+    0x555665665a55, 0x5aa665a65a56, 0x6aaaa6aa9a5a, 0x55555565556a, 0x555665665a55,  # 1961-1965
+    0x5aa665a65a56, 0x6aaaa6aa9a5a, 0x55555555556a, 0x555665665a55, 0x5aa665a65a56,  # 1966-1970
+    0x6aaaa6aa9a5a, 0x55555555556a, 0x555665655a55, 0x5aa665a65a56, 0x6aa6a6aa9a5a,  # 1971-1975
+    0x55555555456a, 0x555655655a55, 0x5a9665a65a56, 0x6aa6a6a69a56, 0x55555555456a,  # 1976-1980
+    0x555655655a55, 0x569665a65a56, 0x6aa6a6a65a56, 0x55555155455a, 0x555655655955,  # 1981-1985
+    0x569665a65a55, 0x5aa6a5a65a56, 0x15555155455a, 0x555555655555, 0x569665665a55,  # 1986-1990
+    0x5aa665a65a56, 0x15555155455a, 0x555555655515, 0x555665665a55, 0x5aa665a65a56,  # 1991-1995
+    0x15555155455a, 0x555555555515, 0x555665665a55, 0x5aa665a65a56, 0x15555155455a,  # 1996-2000
+    0x555555555515, 0x555665665a55, 0x5aa665a65a56, 0x15555155455a, 0x555555555515,  # 2001-2005
+    0x555655655a55, 0x5aa665a65a56, 0x15515155455a, 0x555555554515, 0x555655655a55,  # 2006-2010
+    0x5a9665a65a56, 0x15515151455a, 0x555551554515, 0x555655655a55, 0x569665a65a56,  # 2011-2015
+    0x155151510556, 0x555551554505, 0x555655655955, 0x569665665a55, 0x155110510556,  # 2016-2020
+    0x155551554505, 0x555555655555, 0x569665665a55, 0x055110510556, 0x155551554505,  # 2021-2025
+    0x555555555515, 0x555665665a55, 0x055110510556, 0x155551554505, 0x555555555515,  # 2026-2030
+    0x555665665a55, 0x055110510556, 0x155551554505, 0x555555555515, 0x555655655a55,  # 2031-2035
+    0x055110510556, 0x155551554505, 0x555555555515, 0x555655655a55, 0x055110510556,  # 2036-2040
+    0x155151514505, 0x555555554515, 0x555655655a55, 0x054110510556, 0x155151510505,  # 2041-2045
+    0x555551554515, 0x555655655a55, 0x014110110556, 0x155110510501, 0x555551554505,  # 2046-2050
+    0x555555655555, 0x014110110555, 0x155110510501, 0x555551554505, 0x555555555555,  # 2051-2055
+    0x014110110555, 0x055110510501, 0x155551554505, 0x555555555555, 0x000110110555,  # 2056-2060
+    0x055110510501, 0x155551554505, 0x555555555515, 0x000110110555, 0x055110510501,  # 2061-2065
+    0x155551554505, 0x555555555515, 0x000100100555, 0x055110510501, 0x155151514505,  # 2066-2070
+    0x555555555515, 0x000100100555, 0x054110510501, 0x155151514505, 0x555551554515,  # 2071-2075
+    0x000100100555, 0x054110510501, 0x155150510505, 0x555551554515, 0x000100100555,  # 2076-2080
+    0x014110110501, 0x155110510505, 0x555551554505, 0x000000100055, 0x014110110500,  # 2081-2085
+    0x155110510501, 0x555551554505, 0x000000000055, 0x014110110500, 0x055110510501,  # 2086-2090
+    0x155551554505, 0x000000000055, 0x000110110500, 0x055110510501, 0x155551554505,  # 2091-2095
+    0x000000000015, 0x000100110500, 0x055110510501, 0x155551554505, 0x555555555515,  # 2096-2100
+)
+
+
+def _check_index(index: int) -> None:
+    if not isinstance(index, int):
+        raise TypeError('节气序号只能是整数。')
+    if not 0 <= index <= 23:
+        raise ValueError('节气序号只能是一个从 0 到 23 的整数。')
+
+
+def _ephem_terms(year: int) -> tuple[date, ...]:
+    try:
+        from ccd.ephemeris import _get_terms
+    except ImportError as e:
+        raise OverflowError(
+            f'公历 {year} 年超出内置节气数据的范围，需要安装 PyEphem 才能计算。'
+        ) from e
+    return _get_terms(year)
+
+
+def _days(year: int, first: int, last: int) -> tuple[int, ...]:
+    """第 first 至 last 个节气（不含）的日。"""
+    if TERM_FIRST_YEAR <= year <= TERM_LAST_YEAR:
+        code = TERM_DATAS[year - TERM_FIRST_YEAR]
+        return tuple(TERM_BASE[i] + (code >> 2 * i & 3) for i in range(first, last))
+    return tuple(day.day for day in _ephem_terms(year)[first:last])
+
+
+def term_date(year: int, index: int) -> date:
+    """
+    获取公历某年第 index 个节气的日期。
+
+    :param year: 公历年。
+    :param index: 节气序号，0 为小寒，23 为冬至，参见 ``TERMS`` 。
+    :raise TypeError: 参数类型有误。
+    :raise ValueError: 节气序号有误。
+    :raise OverflowError: 公历年超出内置数据的范围，且没有安装 PyEphem 。
+    """
+    _check_index(index)
+    if TERM_FIRST_YEAR <= year <= TERM_LAST_YEAR:
+        code = TERM_DATAS[year - TERM_FIRST_YEAR]
+        return date(year, index // 2 + 1, TERM_BASE[index] + (code >> 2 * index & 3))
+    return _ephem_terms(year)[index]
+
+
+def term_dates(year: int) -> tuple[date, ...]:
+    """
+    获取公历某年所有节气的日期。
+
+    :param year: 公历年。
+    :return: 24 个日期，顺序与 ``TERMS`` 相同。
+    :raise OverflowError: 公历年超出内置数据的范围，且没有安装 PyEphem 。
+    """
+    if TERM_FIRST_YEAR <= year <= TERM_LAST_YEAR:
+        code = TERM_DATAS[year - TERM_FIRST_YEAR]
+        return tuple(date(year, i // 2 + 1, TERM_BASE[i] + (code >> 2 * i & 3)) for i in range(24))
+    return _ephem_terms(year)
+
+
+def term_on(_date: date) -> int | None:
+    """
+    查找在某个公历日期交节的节气。
+
+    :param _date: 公历日期。
+    :return: 节气序号，参见 ``TERMS`` 。这一天没有交节时返回 ``None`` 。
+    :raise TypeError: 参数类型有误。
+    :raise OverflowError: 公历年超出内置数据的范围，且没有安装 PyEphem 。
+    """
+    if not isinstance(_date, date):
+        raise TypeError(
+            '只接受 datetime.date 及其衍生类型的公历日期。'
+        )
+    # 每个公历月恰好有两个节气
+    index = _date.month * 2 - 2
+    first, second = _days(_date.year, index, index + 2)
+    if _date.day == first:
+        return index
+    if _date.day == second:
+        return index + 1
+    return None
+
+
+def current_term(_date: date) -> int:
+    """
+    查找某个公历日期所处的节气，即这一天或之前最近一次交节的节气。
+
+    :param _date: 公历日期。
+    :return: 节气序号，参见 ``TERMS`` 。公历一月小寒之前的日期属于上一年的冬至，返回 23 。
+    :raise TypeError: 参数类型有误。
+    :raise OverflowError: 公历年超出内置数据的范围，且没有安装 PyEphem 。
+    """
+    if not isinstance(_date, date):
+        raise TypeError(
+            '只接受 datetime.date 及其衍生类型的公历日期。'
+        )
+    index = _date.month * 2 - 2
+    first, second = _days(_date.year, index, index + 2)
+    if _date.day >= second:
+        return index + 1
+    if _date.day >= first:
+        return index
+    return (index - 1) % 24
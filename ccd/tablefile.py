@@ -0,0 +1,118 @@
+"""
+农历数据表的二进制文件格式。
+
+文件由 32 字节的文件头和五个连续的小端序 32 位整数数组组成：
+
+    文件头       魔数 b'CCDT'、格式版本、标志位、first_year、年数、月数、天数、
+                 第一天的公历日期序数、数组部分的 CRC32 校验值
+    DATAS        年数 项
+    _YEAR_ROWS   年数 + 1 项
+    _KEYS        月数 项
+    _STARTS      月数 + 1 项
+    逐日查找表   天数 项（无符号），仅当标志位第 0 位为 1 时存在
+
+各数组的含义见 ``ccd.base`` 。
+使用 ``use()`` 打开文件时，数组直接映射到内存中，不会逐项解析为 Python 对象，
+因此打开的耗时与数据表的大小基本无关，同时打开同一文件的多个进程也会共享同一份物理内存。例如
+
+    from ccd import tablefile, tablegen
+    tablefile.save(tablegen.load('table.json'), 'table.ccdt', days=True)
+    tablefile.use('table.ccdt')
+"""
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from datetime import date
+from typing import NoReturn
+
+from ccd import base
+from ccd.base import Table
+
+MAGIC = b'CCDT'
+VERSION = 1  # 文件格式版本
+HEADER = struct.Struct('<4sHHiIIIiI')
+FLAG_DAYS = 1  # 包含逐日查找表
+
+# 当前映射的文件。数组视图引用着它，切换数据表后不再使用时由垃圾回收关闭。
+_MAPPED: mmap.mmap | None = None
+
+
+def save(table: Table, path, days: bool = False) -> NoReturn:
+    """
+    将数据表保存为二进制文件。
+
+    :param table: 农历数据表。
+    :param path: 文件路径。
+    :param days: 是否同时保存逐日查找表。保存后文件约增大 4 字节/天，打开后无需再生成即可启用逐日查找。
+    """
+    datas, fy = array('i', table.datas), table.first_year
+    keys, starts, year_rows = base._unzip_records(datas, fy, table.first, table.last)
+    arrays = [datas, year_rows, keys, starts]
+    if days:
+        arrays.append(base._unzip_days(keys, starts))
+    if sys.byteorder != 'little':
+        for a in arrays:
+            a.byteswap()
+    payload = b''.join(a.tobytes() for a in arrays)
+    header = HEADER.pack(
+        MAGIC, VERSION, FLAG_DAYS if days else 0, fy,
+        len(datas), len(keys), starts[-1] - starts[0] if days else 0,
+        table.start.toordinal(), zlib.crc32(payload),
+    )
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(payload)
+
+
+def _view(buffer: memoryview, typecode: str):
+    """将一段小端序数据转换为整数序列。小端序平台上不复制数据。"""
+    if sys.byteorder == 'little':
+        return buffer.cast(typecode)
+    a = array(typecode, buffer)
+    a.byteswap()
+    return a
+
+
+def use(path, verify: bool = True) -> NoReturn:
+    """
+    将二进制文件映射到内存中，并切换 ``FastCCD`` 使用其中的数据表。效果与 ``ccd.base.use_table()`` 相同。
+
+    文件在切换到其它数据表之前不能修改。
+
+    :param path: ``save()`` 保存的文件路径。
+    :param verify: 是否校验数组部分的 CRC32 。关闭后打开更快，但不会发现文件损坏。
+    :raise ValueError: 文件格式或版本不受支持，或者文件已损坏。
+    """
+    global _MAPPED
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buffer = memoryview(mm)
+    try:
+        if len(mm) < HEADER.size:
+            raise ValueError(f'不支持的数据表文件：{path}')
+        magic, version, flags, fy, years, months, days, start, crc = HEADER.unpack_from(mm)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'不支持的数据表文件：{path}')
+        counts = (years, years + 1, months, months + 1, days if flags & FLAG_DAYS else 0)
+        if len(mm) != HEADER.size + 4 * sum(counts) or not years or not months:
+            raise ValueError(f'数据表文件已损坏：{path}')
+        if verify and zlib.crc32(buffer[HEADER.size:]) != crc:
+            raise ValueError(f'数据表文件已损坏：{path}')
+    except BaseException:
+        # 校验失败时释放映射，以免文件一直被占用
+        buffer.release()
+        mm.close()
+        raise
+
+    views, offset = [], HEADER.size
+    for count, typecode in zip(counts, 'iiiiI'):
+        views.append(_view(buffer[offset:offset + 4 * count], typecode))
+        offset += 4 * count
+    datas, year_rows, keys, starts, mapped_days = views
+    base._install(
+        datas, fy, date.fromordinal(start), keys, starts, year_rows,
+        mapped_days if flags & FLAG_DAYS else None,
+    )
+    _MAPPED = mm
@@ -0,0 +1,222 @@
+"""
+使用 ephem 计算任意年份范围的农历数据表，格式与 ``ccd.base.DATAS`` 相同。
+
+生成数据表需要安装 PyEphem ，读取已生成的数据表则不需要。比如
+
+    python -m ccd.tablegen 1600 2400 -o table.json
+
+也可以生成与 ``ccd.solarterms.TERM_DATAS`` 格式相同的节气数据（``--terms``）。
+
+生成的数据表可以这样使用：
+
+    from ccd import base, tablegen
+    base.use_table(tablegen.load('table.json'))
+"""
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import NoReturn
+
+from ccd.base import BUILTIN, ORDS_MON, Table
+
+FORMAT = 'ccd-table'
+VERSION = 1  # 文件格式版本
+
+
+def encode_year(year: int) -> int:
+    """
+    计算某个农历年的数据。
+
+    闰月序数在第 13 位及以上，第 1 至 12 位依次表示一至十二月是否为大月（30 天），第 0 位表示闰月是否为大月。
+    """
+    from ccd.ephemeris import _get_months
+    code = 0
+    for month, info in _get_months(year).items():
+        big = int(info.days == 30)
+        if month.is_leap:
+            code |= month.ords << 13 | big
+        else:
+            code |= big << month.ords
+    return code
+
+
+def _encode_years(years: range) -> list[int]:
+    return [encode_year(year) for year in years]
+
+
+def generate(first: int, last: int, processes: int = None, chunksize: int = 20) -> Table:
+    """
+    计算农历 first 年至 last 年（含）的数据表。
+
+    :param first: 第一个农历年。
+    :param last: 最后一个农历年。
+    :param processes: 进程数。如不提供则与 CPU 核数相同。
+    :param chunksize: 每个进程每次计算多少个连续的农历年。相邻的农历年会共用一部分天文计算结果。
+    :return: 从 first 年正月到 last 年最后一个月的数据表。
+    """
+    from ccd.ephemeris import Month, _get_months
+    if first > last:
+        raise ValueError('first 不能大于 last。')
+    years = range(first, last + 1)
+    chunks = [years[i:i + chunksize] for i in range(0, len(years), chunksize)]
+    with ProcessPoolExecutor(processes) as pool:
+        datas = tuple(code for chunk in pool.map(_encode_years, chunks) for code in chunk)
+    start = _get_months(first)[Month(1, False)].start
+    return Table(datas, first, start, (first, 1, False), (last, 12, datas[-1] >> 13 == 12))
+
+
+def _full_years(table: Table) -> range:
+    """数据表中所有月份都有效的农历年。"""
+    (fy, fm, fleap), (ly, lm, lleap) = table.first, table.last
+    lmo = table.datas[ly - table.first_year] >> 13
+    return range(
+        fy if (fm, fleap) == (1, False) else fy + 1,
+        (ly + 1) if (lm, lleap) == (12, lmo == 12) else ly,
+    )
+
+
+def diff(table: Table, other: Table = BUILTIN) -> list[tuple[int, int, int]]:
+    """
+    比较两个数据表中重叠的完整农历年。
+
+    :return: 数据不同的农历年，每一项依次为 农历年、table 中的数据、other 中的数据。
+    """
+    a, b = _full_years(table), _full_years(other)
+    return [
+        (year, x, y)
+        for year in range(max(a.start, b.start), min(a.stop, b.stop))
+        if (x := table.datas[year - table.first_year]) != (y := other.datas[year - other.first_year])
+    ]
+
+
+def describe(x: int, y: int) -> str:
+    """用文字描述两个农历年数据的差异。"""
+    notes = []
+    if (xl := x >> 13) != (yl := y >> 13):
+        name = lambda lmo: f'闰{ORDS_MON[lmo]}月' if lmo else '无闰月'
+        notes.append(f'{name(xl)} / {name(yl)}')
+    for mo in range(1, 13):
+        if (x >> mo ^ y >> mo) & 1:
+            notes.append(f'{ORDS_MON[mo]}月{"大" if x >> mo & 1 else "小"}/{"大" if y >> mo & 1 else "小"}')
+    if xl and xl == yl and (x ^ y) & 1:
+        notes.append(f'闰{ORDS_MON[xl]}月{"大" if x & 1 else "小"}/{"大" if y & 1 else "小"}')
+    return '，'.join(notes)
+
+
+def dump(table: Table, path) -> NoReturn:
+    """将数据表保存为 JSON 文件。"""
+    data = {
+        'format': FORMAT,
+        'version': VERSION,
+        'first_year': table.first_year,
+        'start': table.start.isoformat(),
+        'first': list(table.first),
+        'last': list(table.last),
+        'datas': list(table.datas),
+    }
+    with open(path, 'w', encoding='UTF-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+
+
+def load(path) -> Table:
+    """
+    读取 ``dump()`` 保存的数据表。
+
+    :raise ValueError: 文件格式或版本不受支持。
+    """
+    with open(path, encoding='UTF-8') as f:
+        data = json.load(f)
+    if data.get('format') != FORMAT or data.get('version') != VERSION:
+        raise ValueError(f'不支持的数据表文件：{path}')
+    first, last = data['first'], data['last']
+    return Table(
+        tuple(data['datas']),
+        data['first_year'],
+        date.fromisoformat(data['start']),
+        (first[0], first[1], bool(first[2])),
+        (last[0], last[1], bool(last[2])),
+    )
+
+
+def encode_terms(year: int) -> int:
+    """
+    计算某个公历年的节气数据。
+
+    第 2i 至 2i+1 位表示第 i 个节气的日与 ``ccd.solarterms.TERM_BASE[i]`` 之差。
+
+    :raise ValueError: 节气的日期超出两个二进制位能表示的范围。
+    """
+    from ccd.ephemeris import _get_terms
+    from ccd.solarterms import TERM_BASE, TERMS
+    code = 0
+    for i, day in enumerate(_get_terms(year)):
+        if not 0 <= (offset := day.day - TERM_BASE[i]) <= 3:
+            raise ValueError(f'{TERMS[i]}（{day}）无法编码。')
+        code |= offset << 2 * i
+    return code
+
+
+def terms_to_source(first: int, last: int) -> str:
+    """将公历 first 年至 last 年（含）的节气数据格式化为与 ``ccd.solarterms.TERM_DATAS`` 相同风格的 Python 源码。"""
+    codes = [encode_terms(year) for year in range(first, last + 1)]
+    lines = ['TERM_DATAS = (']
+    for i in range(0, len(codes), 5):
+        row = codes[i:i + 5]
+        y = first + i
+        lines.append(
+            '    ' + ' '.join(f'0x{code:012x},' for code in row) +
+            f'  # {y}-{y + len(row) - 1}'
+        )
+    lines.append(')')
+    return '\n'.join(lines)
+
+
+def to_source(table: Table) -> str:
+    """将逐年数据格式化为与 ``ccd.base.DATAS`` 相同风格的 Python 源码。"""
+    lines = ['DATAS = (']
+    for i in range(0, len(table.datas), 10):
+        row = table.datas[i:i + 10]
+        y = table.first_year + i
+        lines.append(
+            '    ' + ' '.join(f'0x{code:04x},' for code in row) +
+            f'  # {y}-{y + len(row) - 1}'
+        )
+    lines.append(')')
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m ccd.tablegen',
+        description='使用 ephem 并行计算任意年份范围的农历数据表，并与内置数据表比较。',
+    )
+    parser.add_argument('first', type=int, help='第一个农历年')
+    parser.add_argument('last', type=int, help='最后一个农历年（含）')
+    parser.add_argument('-o', '--output', help='保存为 JSON 文件，可以使用 load() 读取')
+    parser.add_argument('-b', '--binary', help='保存为二进制文件（含逐日查找表），可以使用 ccd.tablefile.use() 打开')
+    parser.add_argument('-j', '--processes', type=int, default=None, help='进程数，默认与 CPU 核数相同')
+    parser.add_argument('--source', action='store_true', help='输出与 DATAS 相同风格的 Python 源码')
+    parser.add_argument('--terms', action='store_true',
+                        help='输出公历 first 年至 last 年与 TERM_DATAS 相同风格的节气数据源码')
+    args = parser.parse_args(argv)
+
+    table = generate(args.first, args.last, args.processes)
+    if args.output:
+        dump(table, args.output)
+    if args.binary:
+        from ccd import tablefile
+        tablefile.save(table, args.binary, days=True)
+    if args.source:
+        print(to_source(table))
+    if args.terms:
+        print(terms_to_source(args.first, args.last))
+    differences = diff(table)
+    print(f'与内置数据表重叠的农历年中有 {len(differences)} 年不同。', file=sys.stderr)
+    for year, x, y in differences:
+        print(f'{year}: 0x{x:04x} != 0x{y:04x}  {describe(x, y)}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,298 @@
+"""
+基于 NumPy 的批量公农历转换。需要安装 NumPy 后才可用。
+"""
+from functools import reduce
+
+import numpy as np
+
+from ccd import base
+
+DTYPE = np.dtype([
+    ('year', np.int16),
+    ('month', np.int8),
+    ('day', np.int8),
+    ('is_leap', np.bool_),
+])
+"""批量转换结果的结构化数据类型，各字段与 ``FastCCD.timetuple()`` 一一对应。"""
+
+# 六十甲子，用于按序号批量取出干支
+_SEXAGENARY = np.array(base.SEXAGENARY)
+
+# datetime64[D] 的数值为 0 时（1970-01-01）对应的公历日期序数
+_EPOCH = np.datetime64('1970-01-01', 'D').item().toordinal()
+
+# ccd.base 数据表的 NumPy 视图：月份键、月初的农历日序数（末尾多一项）、每年正月所在的行号（末尾多一项）、
+# 每年闰月的序数；以及生成时 ccd.base 数据表的版本。切换数据表后会重新生成。
+# 前三项直接共享 ccd.base 中数组的内存，不复制数据。
+_TABLES: tuple[np.ndarray, ...] | None = None
+_GENERATION = -1
+
+
+def _get_tables() -> tuple[np.ndarray, ...]:
+    global _TABLES, _GENERATION
+    if _GENERATION != base._GENERATION or _TABLES is None:
+        base._load_tables()
+        _TABLES = (
+            np.asarray(base._KEYS),
+            np.asarray(base._STARTS),
+            np.asarray(base._YEAR_ROWS),
+            np.asarray(base.DATAS, dtype=np.int64) >> 13,
+        )
+        _GENERATION = base._GENERATION
+    return _TABLES
+
+
+def from_ordinals(ordinals, strict: bool = True) -> np.ndarray:
+    """
+    将一组农历日序数批量转换为农历日期。
+
+    :param ordinals: 农历日序数组成的整数数组，与 ``FastCCD.from_ordinal()`` 的参数一致。
+    :param strict: 为真时，只要有一个序数超出范围就抛出异常；
+                   为假时返回一个掩码数组，超出范围的项会被遮盖。
+    :return: ``DTYPE`` 类型的结构化数组，形状与参数相同。
+    :raise OverflowError: 序数超出农历日期范围。
+    """
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    valid = (base.CCD_ORDINAL_MIN <= ordinals) & (ordinals <= base.CCD_ORDINAL_MAX)
+    if strict and not valid.all():
+        raise OverflowError(
+            '超出农历日期范围。'
+        )
+    keys, starts, _, _ = _get_tables()
+    n = np.where(valid, ordinals, base.CCD_ORDINAL_MIN)
+    rows = np.searchsorted(starts, n, side='right') - 1
+    key = keys[rows]
+
+    result = np.empty(ordinals.shape, dtype=DTYPE)
+    result['year'] = (key >> 5) + base.FIRST_YEAR
+    result['month'] = key >> 1 & 15
+    result['day'] = n - starts[rows] + 1
+    result['is_leap'] = key & 1
+    return result if strict else np.ma.array(result, mask=~valid)
+
+
+def from_dates(dates, strict: bool = True) -> np.ndarray:
+    """
+    将一组公历日期批量转换为农历日期。
+
+    :param dates: 公历日期数组，可以是 ``datetime64`` 数组，或者 ``datetime.date`` 组成的序列。
+                  ``NaT`` 视为超出范围。
+    :param strict: 为真时，只要有一个日期超出范围就抛出异常；
+                   为假时返回一个掩码数组，超出范围的项会被遮盖。
+    :return: ``DTYPE`` 类型的结构化数组，形状与参数相同。
+    :raise OverflowError: 公历日期超出农历算法转换范围。
+    """
+    days = np.asarray(dates, dtype='datetime64[D]').astype(np.int64)
+    try:
+        return from_ordinals(days + (_EPOCH - base._DATE_OFFSET), strict)
+    except OverflowError:
+        raise OverflowError(
+            '公历日期超出农历算法转换范围。'
+        ) from None
+
+
+def _encode(y, m, d, leap) -> np.ndarray:
+    """将农历日期编码为可比较大小的整数，顺序与 ``FastCCD.sort_key`` 一致（闰月排在所闰平月的所有日子之后）。"""
+    return ((y * 16 + m) * 2 + leap) * 32 + d
+
+
+def _check(y, m, d, leap) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    批量检查农历日期，规则与 ``_check_date_fields()`` 、 ``_check_date_range()`` 一致。
+
+    :return: 农历月所在的行号（无效项为 -1），字段无效的项，超出范围的项。
+    :raise TypeError: 参数类型错误。
+    """
+    if y.dtype.kind not in 'iu' or m.dtype.kind not in 'iu' or d.dtype.kind not in 'iu':
+        raise TypeError('year、month、day 必须是整数类型。')
+    if leap.dtype.kind != 'b':
+        raise TypeError('is_leap_month 必须是布尔类型。')
+    y, m, d = y.astype(np.int64), m.astype(np.int64), d.astype(np.int64)
+    bad_fields = (m < 1) | (m > 12) | (d < 1) | (d > 30)
+    key = _encode(y, m, d, leap)
+    overflow = ~bad_fields & ((key < _encode(*base.CCD_MIN)) | (key > _encode(*base.CCD_MAX)))
+
+    # 与 _month_row() 相同：由当年正月所在的行号直接算出行号，再核对月份键。
+    # 无效项的下标先截断到有效范围内，最后再剔除，以免逐步筛选
+    keys, starts, year_rows, lmos = _get_tables()
+    yi = np.clip(y - base.FIRST_YEAR, 0, len(lmos) - 1)
+    lmo = lmos[yi]
+    rows = year_rows[yi] + np.where(leap | (0 < lmo) & (lmo < m), m, m - 1)
+    safe = np.clip(rows, 0, len(keys) - 1)
+    ok = ~(bad_fields | overflow) & (rows == safe)
+    ok &= keys[safe] == (yi << 5 | m << 1 | leap)
+    ok &= d <= starts[safe + 1] - starts[safe]
+    result = np.where(ok, rows, -1)
+    return result, bad_fields, overflow
+
+
+def _explain(bad_fields, overflow, masked, invalid) -> Exception:
+    """
+    根据检查结果生成异常，并在异常信息中分类列出所有无效项的下标。
+
+    所有无效项都超出范围时抛出 ``OverflowError`` ，否则抛出 ``ValueError`` 。
+    """
+    def where(mask):
+        rows = np.flatnonzero(mask)
+        head = ', '.join(map(str, rows[:10].tolist()))
+        return head + (f' 等 {len(rows)} 项' if len(rows) > 10 else '')
+
+    bad_fields, overflow = bad_fields & ~masked, overflow & ~masked
+    missing = invalid & ~(bad_fields | overflow | masked)
+    reasons = [
+        (text, mask) for text, mask in (
+            ('被遮盖的项', masked),
+            ('农历月或农历日无效的项（月只能是 1 到 12，日只能是 1 到 30）', bad_fields),
+            ('超出支持范围的项（请使用范围更广的历法算法）', overflow),
+            ('农历日期不存在的项', missing),
+        ) if mask.any()
+    ]
+    message = '；'.join(f'{text}：{where(mask)}' for text, mask in reasons) + '。'
+    return OverflowError(message) if overflow.sum() == invalid.sum() else ValueError(message)
+
+
+def _getmask(a) -> np.ndarray:
+    """取出掩码数组中被遮盖的项。结构化数组的任一字段被遮盖即视为整项被遮盖。"""
+    mask = np.ma.getmaskarray(a)
+    if mask.dtype.names is not None:
+        mask = np.logical_or.reduce([mask[name] for name in mask.dtype.names])
+    return mask
+
+
+def to_ordinals(year, month=None, day=None, is_leap=None, strict: bool = True) -> np.ndarray:
+    """
+    将一组农历日期批量转换为农历日序数。
+
+    所有日期会一次性检查完毕，而不是在遇到第一个无效日期时就停止。
+    参数中被遮盖的项（比如 ``from_dates(..., strict=False)`` 中超出范围的项）也视为无效。
+
+    :param year: 农历年份组成的整数数组；也可以是 ``DTYPE`` 类型的结构化数组，此时忽略其余参数。
+    :param month: 农历月份组成的整数数组。
+    :param day: 农历日组成的整数数组。
+    :param is_leap: 是否闰月组成的布尔数组。如不提供则全部视为平月。
+    :param strict: 为真时，只要有一个日期无效就抛出异常，异常信息中会列出所有无效项的下标；
+                   为假时返回一个掩码数组，无效的项会被遮盖。
+    :return: 农历日序数组成的整数数组。
+    :raise TypeError: 参数类型错误。
+    :raise ValueError: 日期字段错误、日期不存在或者被遮盖。
+    :raise OverflowError: 日期超出可计算范围。
+    """
+    masks = [_getmask(a) for a in (year, month, day, is_leap) if a is not None]
+    year = np.asarray(year)
+    if year.dtype.names is not None:
+        year, month, day, is_leap = (year[name] for name in DTYPE.names)
+    leap = False if is_leap is None else is_leap
+    y, m, d, leap, masked = np.broadcast_arrays(
+        year, np.asarray(month), np.asarray(day), np.asarray(leap), reduce(np.logical_or, masks),
+    )
+    shape = y.shape
+    y, m, d, leap, masked = (a.reshape(-1) for a in (y, m, d, leap, masked))
+
+    rows, bad_fields, overflow = _check(y, m, d, leap)
+    invalid = (rows < 0) | masked
+    if strict and invalid.any():
+        raise _explain(bad_fields, overflow, masked, invalid)
+
+    _, starts, _, _ = _get_tables()
+    result = np.where(invalid, 0, starts[rows] + d - 1).astype(np.int64).reshape(shape)
+    return result if strict else np.ma.array(result, mask=invalid.reshape(shape))
+
+
+def to_dates(year, month=None, day=None, is_leap=None, strict: bool = True) -> np.ndarray:
+    """
+    将一组农历日期批量转换为公历日期。参数与 ``to_ordinals()`` 相同。
+
+    :return: ``datetime64[D]`` 数组。
+    """
+    ordinals = to_ordinals(year, month, day, is_leap, strict)
+    dates = (np.ma.getdata(ordinals) - (_EPOCH - base._DATE_OFFSET)).astype('datetime64[D]')
+    return dates if strict else np.ma.array(dates, mask=np.ma.getmaskarray(ordinals))
+
+
+def day_stem_branches(ordinals, gregorian: bool = False) -> np.ndarray:
+    """
+    批量求农历日序数对应的日干支。直接由序数推算，不需要先转换为农历日期，也没有范围限制。
+
+    :param ordinals: 农历日序数组成的整数数组，与 ``FastCCD.to_ordinal()`` 的结果一致。
+    :param gregorian: 为真时 ordinals 是公历日期序数，与 ``EphemCCD.to_ordinal()`` 的结果一致。
+    :return: 字符串数组，形状与参数相同。
+    :raise TypeError: 参数类型错误。
+    """
+    ordinals = np.asarray(ordinals)
+    if ordinals.dtype.kind not in 'iu':
+        raise TypeError('ordinals 必须是整数类型。')
+    offset = base._DAY_CYCLE if gregorian else base._DATE_OFFSET + base._DAY_CYCLE
+    return _SEXAGENARY[(ordinals.astype(np.int64) + offset) % 60]
+
+
+def month_stem_branches(year, month) -> np.ndarray:
+    """
+    批量求农历月的月干支，规则与 ``FastCCD.month_stem_branch`` 一致。
+
+    :param year: 农历年份组成的整数数组。
+    :param month: 农历月份组成的整数数组。闰月与所闰的月份相同。
+    :return: 字符串数组，形状为两个参数广播后的形状。
+    :raise TypeError: 参数类型错误。
+    :raise ValueError: 农历月不在 1 到 12 之间。
+    """
+    year, month = np.asarray(year), np.asarray(month)
+    if year.dtype.kind not in 'iu' or month.dtype.kind not in 'iu':
+        raise TypeError('year、month 必须是整数类型。')
+    if ((month < 1) | (month > 12)).any():
+        raise ValueError('农历月只能是 1 到 12。')
+    return _SEXAGENARY[(year.astype(np.int64) * 12 + month - 47) % 60]
+
+
+if __name__ == '__main__':
+    import random
+    from datetime import date
+
+    # 批量求出的干支应与逐个求出的一致
+    classes = [base.FastCCD]
+    try:
+        from ccd.ephemeris import EphemCCD
+        classes.append(EphemCCD)
+    except ImportError:
+        pass
+    rng = random.Random(20221018)
+    for cls in classes:
+        dates = [cls.from_date(date(rng.randint(1950, 2050), rng.randint(1, 12), rng.randint(1, 28)))
+                 for _ in range(50)]
+        days = cls.day_stem_branches([d.to_ordinal() for d in dates])
+        assert days.tolist() == [d.day_stem_branch for d in dates], cls
+        months = cls.month_stem_branches([d.year for d in dates], [d.month for d in dates])
+        assert months.tolist() == [d.month_stem_branch for d in dates], cls
+
+    # 批量转换使用 FastCCD 的数据表，子类不能使用
+    for cls in classes[1:]:
+        for method, args in ((cls.from_dates, ([date(2023, 1, 1)],)), (cls.to_ordinals, ([2023], [1], [1]))):
+            try:
+                method(*args)
+            except TypeError:
+                pass
+            else:
+                raise AssertionError(f'{method.__qualname__} 没有抛出 TypeError')
+
+    # 最后一个有效农历月是闰月时，所闰平月的每一天都应在范围内
+    base.use_table(base.Table(base.DATAS, 1900, base.DATE_MIN, (1900, 12, False), (2033, 11, True)))
+    ordinals = np.arange(base.CCD_ORDINAL_MAX - 60, base.CCD_ORDINAL_MAX + 1)
+    assert (to_ordinals(from_ordinals(ordinals)) == ordinals).all()
+    assert to_ordinals([2033], [11], [30])[0] == base.FastCCD(2033, 11, 30).to_ordinal()
+    base.use_table()
+
+    # 被遮盖的项不能当作有效日期转换；所有无效项都应列出
+    lunar = from_dates([date(1800, 1, 1), date(2020, 6, 20)], strict=False)
+    dates = to_dates(lunar, strict=False)
+    assert dates.mask.tolist() == [True, False] and str(dates[1]) == '2020-06-20'
+    try:
+        to_ordinals(lunar)
+    except ValueError as e:
+        assert '被遮盖的项：0' in str(e), e
+    else:
+        raise AssertionError('没有抛出 ValueError')
+    try:
+        to_ordinals([2020, 2020, 1800, 2021, 1800], [13, 4, 1, 4, 1], [1, 29, 1, 1, 2], [False, True, False, True, False])
+    except ValueError as e:
+        assert all(text in str(e) for text in ('：0；', '：2, 4；', '：3。')), e
+    else:
+        raise AssertionError('没有抛出 ValueError')
@@ -0,0 +1,473 @@
+"""
+性能基准测试。
+
+在仓库根目录下运行：
+
+    python -m tests.benchmark                      # 运行所有基准测试
+    python -m tests.benchmark -k strptime          # 只运行名称包含 strptime 的基准测试
+    python -m tests.benchmark -o result.json       # 保存结果
+    python -m tests.benchmark -b baseline.json     # 与之前保存的结果比较，有性能退化时以状态码 1 退出
+
+所有输入数据都由固定的随机数种子生成。每项测试先预热一轮，再重复计时若干轮并取最小值，
+以每次操作的纳秒数表示；导入耗时以毫秒表示；内存占用以字节表示。数值都是越小越好。
+"""
+import argparse
+import gc
+import json
+import os
+import pickle
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+from statistics import median
+from typing import Callable
+
+from ccd import __version__
+from ccd.base import FastCCD
+
+try:
+    from ccd.ephemeris import EphemCCD
+except ImportError:
+    EphemCCD = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED = 20221018
+FORMAT = 'ccd-benchmark'
+VERSION = 1  # 结果文件格式版本
+
+BENCHMARKS: dict[str, tuple[Callable, int, int]] = {}
+
+
+def benchmark(name: str, size: int = 20_000, ephem_size: int = 2_000):
+    """
+    注册一项同时在 FastCCD 和 EphemCCD 上运行的基准测试。
+
+    被装饰的函数接受 (农历日期类型, 随机数生成器, 操作次数) ，准备好输入数据，
+    然后返回一个无参数的函数，每次调用时执行指定次数的操作。
+
+    :param name: 名称，结果中会加上类名作为前缀。
+    :param size: FastCCD 每轮的操作次数。
+    :param ephem_size: EphemCCD 每轮的操作次数。
+    """
+    def decorator(setup):
+        BENCHMARKS[name] = (setup, size, ephem_size)
+        return setup
+
+    return decorator
+
+
+def _dates(cls, rng: random.Random, n: int) -> list:
+    """生成 n 个随机农历日期。取 FastCCD 范围的中间部分，使得加减一定天数后仍然有效。"""
+    first, last = date(1910, 1, 1).toordinal(), date(2090, 12, 31).toordinal()
+    return [cls.from_date(date.fromordinal(rng.randint(first, last))) for _ in range(n)]
+
+
+@benchmark('__new__')
+def _new(cls, rng, n):
+    fields = [d.timetuple() for d in _dates(cls, rng, n)]
+    assert cls(2022, 9, 23).timetuple() == (2022, 9, 23, False)
+    return lambda: [cls(*f) for f in fields]
+
+
+@benchmark('from_date')
+def _from_date(cls, rng, n):
+    days = [d.to_date() for d in _dates(cls, rng, n)]
+    assert cls.from_date(date(2022, 10, 18)).timetuple() == (2022, 9, 23, False)
+    return lambda: [cls.from_date(d) for d in days]
+
+
+@benchmark('from_ordinal')
+def _from_ordinal(cls, rng, n):
+    ordinals = [d.to_ordinal() for d in _dates(cls, rng, n)]
+    return lambda: [cls.from_ordinal(o) for o in ordinals]
+
+
+@benchmark('to_date')
+def _to_date(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    assert cls(2022, 9, 23).to_date() == date(2022, 10, 18)
+    return lambda: [d.to_date() for d in dates]
+
+
+@benchmark('to_ordinal')
+def _to_ordinal(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    return lambda: [d.to_ordinal() for d in dates]
+
+
+@benchmark('__add__ (1 day)')
+def _add_one(cls, rng, n):
+    dates, one = _dates(cls, rng, n), timedelta(days=1)
+    assert (cls(2022, 9, 23) + one).timetuple() == (2022, 9, 24, False)
+    return lambda: [d + one for d in dates]
+
+
+@benchmark('__add__ (random)')
+def _add_random(cls, rng, n):
+    pairs = [(d, timedelta(days=rng.randint(-3000, 3000))) for d in _dates(cls, rng, n)]
+    assert (cls(2022, 9, 23) + timedelta(days=21)).timetuple() == (2022, 10, 15, False)
+    return lambda: [d + delta for d, delta in pairs]
+
+
+@benchmark('__sub__ (1 day)')
+def _sub_one(cls, rng, n):
+    dates, one = _dates(cls, rng, n), timedelta(days=1)
+    return lambda: [d - one for d in dates]
+
+
+@benchmark('replace')
+def _replace(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    return lambda: [d.replace(day=1) for d in dates]
+
+
+@benchmark('__str__')
+def _str(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    assert str(cls(2022, 9, 23)) == '农历2022年九月廿三'
+    return lambda: [str(d) for d in dates]
+
+
+@benchmark('strftime')
+def _strftime(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    assert cls(2010, 1, 22).strftime('%G%g年%b月%a') == '庚寅虎年正月廿二'
+    return lambda: [d.strftime('%G%g年%b月%a') for d in dates]
+
+
+@benchmark('strptime')
+def _strptime(cls, rng, n):
+    strings = [str(d) for d in _dates(cls, rng, n)]
+    assert cls.strptime('农历2020年闰四月廿九').timetuple() == (2020, 4, 29, True)
+    return lambda: [cls.strptime(s) for s in strings]
+
+
+@benchmark('days_in_year')
+def _days_in_year(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    assert cls(2020, 1, 1).days_in_year == 384
+    return lambda: [d.days_in_year for d in dates]
+
+
+@benchmark('days_in_month')
+def _days_in_month(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    return lambda: [d.days_in_month for d in dates]
+
+
+@benchmark('day_of_year')
+def _day_of_year(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    assert cls(2020, 4, 1, True).day_of_year == 120
+    return lambda: [d.day_of_year for d in dates]
+
+
+@benchmark('year_stem_branch')
+def _year_stem_branch(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    assert cls(2022, 9, 23).year_stem_branch == '壬寅'
+    return lambda: [d.year_stem_branch for d in dates]
+
+
+@benchmark('month_stem_branch')
+def _month_stem_branch(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    assert cls(2023, 1, 1).month_stem_branch == '甲寅'
+    return lambda: [d.month_stem_branch for d in dates]
+
+
+@benchmark('day_stem_branch')
+def _day_stem_branch(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    assert cls(2023, 1, 1).day_stem_branch == '庚辰'
+    return lambda: [d.day_stem_branch for d in dates]
+
+
+@benchmark('year_start')
+def _year_start(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    return lambda: [d.year_start() for d in dates]
+
+
+@benchmark('year_end')
+def _year_end(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    return lambda: [d.year_end() for d in dates]
+
+
+@benchmark('format_many')
+def _format_many(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    return lambda: list(cls.format_many(dates))
+
+
+@benchmark('strptime_many')
+def _strptime_many(cls, rng, n):
+    strings = [str(d) for d in _dates(cls, rng, n)]
+    return lambda: list(cls.strptime_many(strings))
+
+
+@benchmark('pickle')
+def _pickle(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    assert pickle.loads(pickle.dumps(dates)) == dates
+    return lambda: pickle.loads(pickle.dumps(dates))
+
+
+@benchmark('__eq__')
+def _eq(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    others = [d.replace() for d in dates]
+    return lambda: [a == b for a, b in zip(dates, others)]
+
+
+@benchmark('__lt__')
+def _lt(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    others = dates[1:] + dates[:1]
+    return lambda: [a < b for a, b in zip(dates, others)]
+
+
+@benchmark('__hash__')
+def _hash(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    return lambda: [hash(d) for d in dates]
+
+
+@benchmark('sorted')
+def _sorted(cls, rng, n):
+    dates = _dates(cls, rng, n)
+    return lambda: sorted(dates)
+
+
+@benchmark('range')
+def _range(cls, rng, n):
+    start = cls.from_date(date(1950, 1, 1))
+    stop = cls.from_date(date(1950, 1, 1) + timedelta(days=n))
+    return lambda: [d for d in cls.range(start, stop)]
+
+
+# 作为参照的 datetime.date
+
+REFERENCES: dict[str, Callable] = {}
+
+
+def reference(name: str):
+    def decorator(setup):
+        REFERENCES[name] = setup
+        return setup
+
+    return decorator
+
+
+def _gregorian(rng, n) -> list[date]:
+    first, last = date(1910, 1, 1).toordinal(), date(2090, 12, 31).toordinal()
+    return [date.fromordinal(rng.randint(first, last)) for _ in range(n)]
+
+
+@reference('__new__')
+def _date_new(rng, n):
+    fields = [(d.year, d.month, d.day) for d in _gregorian(rng, n)]
+    return lambda: [date(*f) for f in fields]
+
+
+@reference('__add__ (1 day)')
+def _date_add_one(rng, n):
+    days, one = _gregorian(rng, n), timedelta(days=1)
+    return lambda: [d + one for d in days]
+
+
+@reference('__str__')
+def _date_str(rng, n):
+    days = _gregorian(rng, n)
+    return lambda: [str(d) for d in days]
+
+
+@reference('sorted')
+def _date_sorted(rng, n):
+    days = _gregorian(rng, n)
+    return lambda: sorted(days)
+
+
+def _time(func: Callable, number: int, repeat: int) -> float:
+    """预热一轮后重复计时，返回每次操作的最小纳秒数。计时期间暂停垃圾回收。"""
+    func()
+    timings = []
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            func()
+            timings.append(time.perf_counter_ns() - start)
+    finally:
+        if enabled:
+            gc.enable()
+    return min(timings) / number
+
+
+def run_operations(repeat: int, keyword: str = '') -> dict:
+    results = {}
+    classes = [FastCCD] if EphemCCD is None else [FastCCD, EphemCCD]
+    for name, (setup, size, ephem_size) in BENCHMARKS.items():
+        for cls in classes:
+            title = f'{cls.__name__}.{name}'
+            if keyword not in title:
+                continue
+            n = size if cls is FastCCD else ephem_size
+            results[title] = {'value': _time(setup(cls, random.Random(SEED), n), n, repeat), 'unit': 'ns'}
+    for name, setup in REFERENCES.items():
+        title = f'date.{name}'
+        if keyword in title:
+            results[title] = {'value': _time(setup(random.Random(SEED), 20_000), 20_000, repeat), 'unit': 'ns'}
+    return results
+
+
+def _subprocess(code: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output)
+
+
+_IMPORT_CODE = '''
+import json, time
+t0 = time.perf_counter()
+import ccd
+t1 = time.perf_counter()
+ccd.FastCCD.from_date(__import__('datetime').date(2022, 10, 18))
+t2 = time.perf_counter()
+print(json.dumps({'import ccd': (t1 - t0) * 1e3, 'import ccd + first conversion': (t2 - t0) * 1e3}))
+'''
+
+
+def run_import(repeat: int, keyword: str = '') -> dict:
+    """在新的进程中测量导入耗时，取最小值。"""
+    if 'import' not in keyword and keyword:
+        return {}
+    timings = [_subprocess(_IMPORT_CODE) for _ in range(max(repeat, 10))]
+    return {
+        name: {'value': min(t[name] for t in timings), 'unit': 'ms'}
+        for name in timings[0]
+    }
+
+
+_MEMORY_CODE = '''
+import json, sys, tracemalloc
+from datetime import date, timedelta
+tracemalloc.start()
+from ccd import base
+results = {}
+used = lambda: tracemalloc.get_traced_memory()[0]
+before = used()
+base._load_tables()
+results['tables'] = used() - before
+before = used()
+base.MONTHS, base.NEW_MOONS, base.YEARS
+results['compat tables (MONTHS, NEW_MOONS, YEARS)'] = used() - before
+before = used()
+base.dense_lookup()
+base.FastCCD.from_ordinal(1)
+results['dense lookup table'] = used() - before
+base.dense_lookup(False)
+results['FastCCD instance'] = sys.getsizeof(base.FastCCD(2022, 9, 23))
+before = used()
+days = list(base.FastCCD.range(base.FastCCD(1950, 1, 1), base.FastCCD(2050, 1, 1)))
+results['FastCCD x %d' % len(days)] = used() - before
+print(json.dumps(results))
+'''
+
+
+def run_memory(keyword: str = '') -> dict:
+    """在新的进程中测量内存占用。"""
+    if keyword and 'memory' not in keyword:
+        return {}
+    return {
+        f'memory: {name}': {'value': value, 'unit': 'B'}
+        for name, value in _subprocess(_MEMORY_CODE).items()
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    与基准结果比较。
+
+    :return: 退化超过 threshold（相对值）的项目名称。
+    """
+    regressions = []
+    for name, item in results.items():
+        if name not in baseline or not baseline[name]['value']:
+            continue
+        ratio = item['value'] / baseline[name]['value']
+        item['baseline'] = baseline[name]['value']
+        item['change'] = ratio - 1
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+def report(results: dict, regressions: list[str]) -> str:
+    width = max(map(len, results), default=0)
+    lines = []
+    for name, item in results.items():
+        line = f'{name:<{width}}  {item["value"]:>14,.1f} {item["unit"]:<2}'
+        if 'change' in item:
+            line += f'  {item["baseline"]:>14,.1f}  {item["change"]:+7.1%}'
+            if name in regressions:
+                line += '  退化'
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tests.benchmark', description='运行 ccd 的性能基准测试。')
+    parser.add_argument('-k', '--keyword', default='', help='只运行名称包含该字符串的测试')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='每项测试重复计时的轮数，默认 5')
+    parser.add_argument('-o', '--output', help='将结果保存为 JSON 文件')
+    parser.add_argument('-b', '--baseline', help='与之前保存的 JSON 结果比较')
+    parser.add_argument('-t', '--threshold', type=float, default=0.15,
+                        help='比基准慢多少（相对值）视为退化，默认 0.15')
+    args = parser.parse_args(argv)
+
+    results = run_operations(args.repeat, args.keyword)
+    results |= run_import(args.repeat, args.keyword)
+    results |= run_memory(args.keyword)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='UTF-8') as f:
+            baseline = json.load(f)
+        if baseline.get('format') != FORMAT or baseline.get('version') != VERSION:
+            parser.error(f'不支持的结果文件：{args.baseline}')
+        regressions = compare(results, baseline['results'], args.threshold)
+    print(report(results, regressions))
+
+    if args.output:
+        data = {
+            'format': FORMAT,
+            'version': VERSION,
+            'meta': {
+                'ccd': __version__,
+                'python': platform.python_version(),
+                'implementation': platform.python_implementation(),
+                'platform': platform.platform(),
+                'ephem': EphemCCD is not None,
+                'seed': SEED,
+                'repeat': args.repeat,
+                'time': datetime.now().isoformat(timespec='seconds'),
+            },
+            'results': {name: {'value': item['value'], 'unit': item['unit']} for name, item in results.items()},
+        }
+        with open(args.output, 'w', encoding='UTF-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    if regressions:
+        print(f'\n{len(regressions)} 项性能退化超过 {args.threshold:.0%}。', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""
+EphemCCD 在多线程下的压力测试与吞吐量测试。需要安装 PyEphem 。
+
+在仓库根目录下运行：
+
+    python -m tests.concurrency                 # 压力测试：检查同一年份只计算一次，且结果与单线程一致；以及异步方法
+    python -m tests.concurrency --bench         # 吞吐量随线程数的变化
+    python -m tests.concurrency --bench -t 1 2 4 8 16
+"""
+import argparse
+import asyncio
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from ccd import ephemeris
+from ccd.cache import LRUCache
+from ccd.ephemeris import EphemCCD, async_executor
+
+SEED = 20221018
+
+
+class _CountingCalc(object):
+    """代替 ``ephemeris._calc_months`` ，统计每个公历年被计算的次数。"""
+
+    def __init__(self):
+        self.counts = Counter()
+        self._lock = threading.Lock()
+        self._func = ephemeris._calc_months
+
+    def __call__(self, year):
+        with self._lock:
+            self.counts[year] += 1
+        return self._func(year)
+
+    def __enter__(self):
+        ephemeris._calc_months = self
+        return self
+
+    def __exit__(self, *exc_info):
+        ephemeris._calc_months = self._func
+
+
+def _cold():
+    """清空内存缓存并停用持久化缓存，使后续的转换都需要重新计算。"""
+    ephemeris.disk_cache(False)
+    ephemeris.ENUM_CACHE.clear()
+    ephemeris.YEAR_CACHE.clear()
+
+
+def _convert(day: date) -> tuple:
+    lunar = EphemCCD.from_date(day)
+    later = lunar + timedelta(days=45)
+    return lunar.timetuple(), lunar.to_date(), lunar.days_in_year, later.timetuple(), later.to_date()
+
+
+def _run(days: list[date], threads: int) -> list:
+    barrier = threading.Barrier(threads)
+
+    def work(chunk):
+        barrier.wait()  # 让所有线程同时开始，尽量在同一时刻查找相同的年份
+        return [_convert(day) for day in chunk]
+
+    chunks = [days[i::threads] for i in range(threads)]
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(work, chunks))
+    # 还原为 days 中的顺序
+    ordered = [None] * len(days)
+    for i, chunk in enumerate(results):
+        ordered[i::threads] = chunk
+    return ordered
+
+
+def test_single_flight(threads: int = 32, rounds: int = 5):
+    """多个线程同时转换少数几个年份的日期，每个公历年只应计算一次，结果应与单线程一致。"""
+    rng = random.Random(SEED)
+    years = rng.sample(range(1700, 2400), 4)
+    days = [date(rng.choice(years), rng.randint(1, 12), rng.randint(1, 28)) for _ in range(threads * 20)]
+
+    _cold()
+    expected = [_convert(day) for day in days]
+    for _ in range(rounds):
+        _cold()
+        with _CountingCalc() as calc:
+            assert _run(days, threads) == expected
+        duplicates = {year: n for year, n in calc.counts.items() if n > 1}
+        assert not duplicates, f'重复计算：{duplicates}'
+    print(f'single flight: {threads} 个线程 x {rounds} 轮，'
+          f'{len(calc.counts)} 个公历年各计算 1 次，等待 {ephemeris.ENUM_CACHE.waits} 次')
+
+
+def test_independent_keys(threads: int = 8, delay: float = 0.2):
+    """不同的键应当同时计算，而不是依次计算。"""
+    cache = LRUCache(16)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda key: cache.lookup(key, time.sleep, delay), range(threads)))
+    elapsed = time.perf_counter() - start
+    assert elapsed < delay * 2, f'{threads} 个不同的键耗时 {elapsed:.2f}s，计算被串行化了'
+    print(f'independent keys: {threads} 个不同的键耗时 {elapsed:.2f}s（单次 {delay}s）')
+
+
+def test_errors(threads: int = 8):
+    """计算出错时，等待的线程也得到同一个异常，之后可以重新计算。"""
+    cache = LRUCache(16)
+    calls = Counter()
+    barrier = threading.Barrier(threads)
+
+    def fail(key):
+        calls[key] += 1
+        time.sleep(0.1)
+        raise RuntimeError(key)
+
+    def work(_):
+        barrier.wait()
+        try:
+            cache.lookup('key', fail, 'key')
+        except RuntimeError as e:
+            return e
+        raise AssertionError('没有抛出异常')
+
+    with ThreadPoolExecutor(threads) as pool:
+        errors = list(pool.map(work, range(threads)))
+    assert calls['key'] == 1 and len(set(map(id, errors))) == 1
+    assert cache.lookup('key', str, 'ok') == 'ok'
+    assert 'key' in cache and not cache._flights
+    print(f'errors: {threads} 个线程共享 1 个异常，之后重新计算成功')
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    """统计提交了多少次任务的线程池。"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+def test_async():
+    """异步方法在需要计算时不阻塞事件循环，所需数据已缓存时不经过执行器，批量转换的结果与同步方法一致。"""
+    rng = random.Random(SEED)
+    years = rng.sample(range(1700, 2300), 20)  # 不超过缓存容量，以免淘汰后重新计算
+    days = [date(rng.choice(years), rng.randint(1, 12), rng.randint(1, 28)) for _ in range(200)]
+    _cold()
+    expected = [EphemCCD.from_date(day) for day in days]
+    expected_dates = [lunar.to_date() for lunar in expected]
+
+    async def ticker(ticks: list):
+        while True:
+            await asyncio.sleep(0)
+            ticks[0] += 1
+
+    async def run():
+        with _CountingExecutor(4) as executor:
+            async_executor(executor)
+            try:
+                # 冷缓存：在执行器中计算，期间事件循环仍在运行其它任务
+                _cold()
+                ticks = [0]
+                task = asyncio.create_task(ticker(ticks))
+                lunar = await EphemCCD.afrom_date(days[0])
+                task.cancel()
+                assert lunar == expected[0] and executor.submitted == 1 and ticks[0] > 0
+                # 热缓存：直接返回
+                submitted = executor.submitted
+                assert await EphemCCD.afrom_date(days[0]) == expected[0]
+                assert await lunar.ato_date() == days[0]
+                assert await lunar.adays_in_year() == lunar.days_in_year
+                assert await lunar.adays_in_month() == lunar.days_in_month
+                assert await lunar.aday_of_year() == lunar.day_of_year
+                assert await lunar.ato_ordinal() == days[0].toordinal()
+                assert await EphemCCD.afrom_ordinal(days[0].toordinal()) == expected[0]
+                assert executor.submitted == submitted
+                # 批量转换：按年份分组，每个公历年只计算一次
+                _cold()
+                with _CountingCalc() as calc:
+                    assert await EphemCCD.afrom_dates(days) == expected
+                assert max(calc.counts.values()) == 1
+                _cold()
+                assert await EphemCCD.ato_dates(expected) == expected_dates
+                try:
+                    await EphemCCD.afrom_dates([days[0], '2000-01-01'])
+                except TypeError:
+                    pass
+                else:
+                    raise AssertionError('没有抛出 TypeError')
+                return executor.submitted
+            finally:
+                async_executor(None)
+
+    submitted = asyncio.run(run())
+    print(f'async: {len(days)} 个日期，执行器共执行 {submitted} 次')
+
+
+def benchmark(thread_counts: list[int], years: int = 64, per_year: int = 50):
+    """
+    测量不同线程数下的吞吐量。
+
+    冷缓存时每个公历年都需要用 ephem 计算，热缓存时只读取内存缓存。
+    在有 GIL 的构建上，ephem 的计算不会并行，吞吐量主要取决于是否重复计算；
+    在自由线程（free-threaded）构建上，不同年份的计算可以并行。
+    """
+    rng = random.Random(SEED)
+    first = rng.randint(1700, 2300)
+    days = [
+        date(first + i % years, rng.randint(1, 12), rng.randint(1, 28))
+        for i in range(years * per_year)
+    ]
+    rng.shuffle(days)
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'Python {sys.version.split()[0]}，GIL {"启用" if gil else "停用"}，'
+          f'{len(days)} 次转换，涉及 {years} 个农历年')
+    print(f'{"线程数":>6}  {"冷缓存 次/秒":>12}  {"ephem 计算次数":>14}  {"等待次数":>8}  {"热缓存 次/秒":>12}')
+    for threads in thread_counts:
+        _cold()
+        with _CountingCalc() as calc:
+            start = time.perf_counter()
+            _run(days, threads)
+            cold = time.perf_counter() - start
+        start = time.perf_counter()
+        _run(days, threads)
+        warm = time.perf_counter() - start
+        print(f'{threads:>6}  {len(days) / cold:>12,.0f}  {sum(calc.counts.values()):>14}  '
+              f'{ephemeris.ENUM_CACHE.waits + ephemeris.YEAR_CACHE.waits:>8}  {len(days) / warm:>12,.0f}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tests.concurrency', description='EphemCCD 的并发测试。')
+    parser.add_argument('--bench', action='store_true', help='测量吞吐量随线程数的变化，而不是运行压力测试')
+    parser.add_argument('-t', '--threads', type=int, nargs='+', default=[1, 2, 4, 8, 16], help='线程数')
+    args = parser.parse_args(argv)
+    if args.bench:
+        benchmark(args.threads)
+    else:
+        test_single_flight()
+        test_independent_keys()
+        test_errors()
+        test_async()
+
+
+if __name__ == '__main__':
+    main()